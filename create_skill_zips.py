@@ -1,7 +1,12 @@
+import argparse
 import os
-import zipfile
+import sys
 from pathlib import Path
 
+from zip_builder import (
+    LARGE_TEXT_METHODS, build_zip, load_manifest, run_jobs, save_manifest,
+)
+
 # Skills to zip (excluding non-skill directories)
 skills = [
     'artifacts-builder',
@@ -28,32 +33,62 @@ skills = [
     'webapp-testing'
 ]
 
-# Create output directory
 output_dir = Path('skill-zips')
-output_dir.mkdir(exist_ok=True)
 
-def zip_skill(skill_name):
-    """Create a zip file for a skill directory"""
+
+def zip_skill(skill_name, previous=None, force=False, large_text=None):
+    """
+    Create a zip file for a skill directory.
+
+    Returns:
+        (status, message, manifest_entry) tuple; status is 'created',
+        'up-to-date' or 'missing', and the entry is None if missing
+    """
     skill_path = Path(skill_name)
     if not skill_path.exists():
-        print(f"Skipping {skill_name} - directory not found")
-        return
+        return 'missing', f"Skipping {skill_name} - directory not found", None
 
     zip_path = output_dir / f"{skill_name}.zip"
+    # Make paths relative to the skill directory itself, not its parent
+    message, entry = build_zip(skill_path, zip_path, skill_path, previous, force,
+                               large_text)
+    # build_zip hands back the previous entry unchanged when it skips the build
+    if previous is not None and entry is previous:
+        return 'up-to-date', f"Skipped: {zip_path} {message}", entry
+    return 'created', f"Created: {zip_path} {message}", entry
+
+
+def main():
+    """Zip all skills listed above into skill-zips/."""
+    parser = argparse.ArgumentParser(description="Create skill zip files")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild every zip even if unchanged")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Zip skills in parallel on N processes "
+                             "(0 = one per CPU; default: 1)")
+    parser.add_argument("--large-text", choices=sorted(LARGE_TEXT_METHODS),
+                        help="Compress text files over 1 MiB with LZMA or bzip2")
+    args = parser.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
+
+    output_dir.mkdir(exist_ok=True)
+    manifest = load_manifest(output_dir)
 
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(skill_path):
-            for file in files:
-                file_path = Path(root) / file
-                # Make paths relative to the skill directory itself, not its parent
-                arcname = file_path.relative_to(skill_path)
-                zipf.write(file_path, arcname)
+    print("Creating skill zip files...")
+    jobs_args = [(skill, manifest.get(skill), args.force, args.large_text)
+                 for skill in skills]
+    counts = {'created': 0, 'up-to-date': 0, 'missing': 0}
+    for skill, (status, message, entry) in zip(skills, run_jobs(zip_skill, jobs_args, jobs)):
+        print(message)
+        counts[status] += 1
+        if entry is not None:
+            manifest[skill] = entry
 
-    print(f"Created: {zip_path}")
+    save_manifest(output_dir, manifest)
+    print(f"\nDone! Created {counts['created']} zip files in the 'skill-zips' directory "
+          f"({counts['up-to-date']} up to date, {counts['missing']} not found)")
+    return 0
 
-# Zip all skills
-print("Creating skill zip files...")
-for skill in skills:
-    zip_skill(skill)
 
-print(f"\nDone! Created {len(skills)} zip files in the 'skill-zips' directory")
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,130 +1,504 @@
 #!/usr/bin/env python3
 """
 Project health check script.
+
+Each check is an independent probe registered in CHECKS. Probes run
+concurrently, each with its own timeout, and report a status, the time
+they took and any recommendations; --json prints the same report for
+monitoring.
 """
 
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import py_compile
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 
+from zip_builder import file_digest, load_manifest, skill_files, tree_hash
 
-def check_python():
-    """Check Python environment."""
-    print("\nPYTHON ENVIRONMENT:")
-    print("-" * 60)
-    print(f"Version: {sys.version}")
-    print(f"Executable: {sys.executable}")
+# Never searched for sources
+SKIP_DIRS = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', '.tox',
+             'packaged-skills', 'skill-zips'}
+# Below this many stale files a process pool costs more than it saves
+MIN_PARALLEL_FILES = 16
+# Statuses from best to worst; the report's overall status is the worst one
+STATUSES = ['ok', 'warn', 'fail', 'timeout', 'error']
+LABELS = {'ok': '[OK]', 'warn': '[!]', 'fail': '[FAIL]', 'timeout': '[TIMEOUT]',
+          'error': '[ERROR]', 'missing': '[ ]'}
+MIN_PYTHON = (3, 8)
 
+# Probes by name, in report order, filled in by @register
+CHECKS = {}
+# Worker pools in use, by the name of the probe thread that owns them
+POOLS = {}
+POOLS_LOCK = threading.Lock()
 
-def check_scripts():
-    """Validate Python scripts."""
-    print("\nSCRIPTS STATUS:")
-    print("-" * 60)
 
-    scripts = list(Path('.').glob('*.py'))
-    for script in sorted(scripts):
-        result = subprocess.run(
-            ['python', '-m', 'py_compile', str(script)],
-            capture_output=True
-        )
-        status = "[OK]" if result.returncode == 0 else "[FAIL]"
-        print(f"{status} {script.name}")
+def register(name, title):
+    """
+    Decorator that adds a probe to CHECKS.
 
+    A probe takes the parsed options and returns a dict with status,
+    items (lines of {status, name, detail}) and optionally data and
+    recommendations. Probes must not print.
+    """
+    def decorator(func):
+        CHECKS[name] = {'title': title, 'func': func}
+        return func
+    return decorator
 
-def check_structure():
-    """Check project structure."""
-    print("\nPROJECT STRUCTURE:")
-    print("-" * 60)
 
-    dirs = ['skills', 'packaged-skills', 'skill-zips', '.git']
-    for d in dirs:
+def result(items=(), data=None, recommendations=(), status=None):
+    """Build a probe result; status defaults to the worst item status."""
+    items = list(items)
+    if status is None:
+        status = worst(item['status'] for item in items)
+    return {'status': status, 'items': items, 'data': data or {},
+            'recommendations': list(recommendations)}
+
+
+def item(status, name, detail=''):
+    """One line of a probe's report."""
+    return {'status': status, 'name': name, 'detail': detail}
+
+
+def failed(status, error):
+    """Result for a probe that timed out or raised instead of reporting."""
+    outcome = result(status=status)
+    outcome['error'] = error
+    return outcome
+
+
+def worst(statuses):
+    """Worst of several statuses ('missing' counts as a warning)."""
+    ranks = [STATUSES.index('warn' if s == 'missing' else s) for s in statuses]
+    return STATUSES[max(ranks, default=0)]
+
+
+def python_sources(root='.', recursive=False):
+    """Python files directly in root, or the whole tree below it when recursive."""
+    if not recursive:
+        return sorted(str(p) for p in Path(root).glob('*.py'))
+    sources = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        sources.extend(os.path.normpath(os.path.join(dirpath, name))
+                       for name in filenames if name.endswith('.py'))
+    return sorted(sources)
+
+
+def bytecode_current(path):
+    """
+    True if __pycache__ already holds bytecode for the current source.
+
+    Mirrors the import system's check: the .pyc header must carry this
+    interpreter's magic number and either the source mtime and size or,
+    for hash-based .pyc files, the source hash.
+    """
+    try:
+        with open(importlib.util.cache_from_source(path), 'rb') as f:
+            header = f.read(16)
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return False
+    if len(header) < 16 or header[:4] != importlib.util.MAGIC_NUMBER:
+        return False
+    flags = int.from_bytes(header[4:8], 'little')
+    if flags & 0b1:
+        with open(path, 'rb') as f:
+            return header[8:16] == importlib.util.source_hash(f.read())
+    return (int.from_bytes(header[8:12], 'little') == int(st.st_mtime) & 0xFFFFFFFF
+            and int.from_bytes(header[12:16], 'little') == st.st_size & 0xFFFFFFFF)
+
+
+def compile_source(path):
+    """
+    Compile one file in this process and write its bytecode.
+
+    Returns:
+        (path, error message or None, seconds) tuple
+    """
+    start = time.perf_counter()
+    try:
+        py_compile.compile(path, doraise=True)
+        error = None
+    except py_compile.PyCompileError as e:
+        if isinstance(e.exc_value, SyntaxError):
+            error = f"{e.exc_type_name}: {e.exc_value.msg} (line {e.exc_value.lineno})"
+        else:
+            error = f"{e.exc_type_name}: {e.exc_value}"
+    except OSError as e:
+        error = str(e)
+    return path, error, time.perf_counter() - start
+
+
+class WorkerPool:
+    """
+    Process pool owned by the calling probe.
+
+    run_checks kills the pools of a probe that overruns its timeout, so
+    worker processes never outlive the report.
+    """
+
+    def __init__(self, jobs):
+        self.owner = threading.current_thread().name
+        self.pool = multiprocessing.Pool(jobs)
+        self.killed = threading.Event()
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        with POOLS_LOCK:
+            POOLS.setdefault(self.owner, []).append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        with POOLS_LOCK:
+            POOLS[self.owner].remove(self)
+        self.kill()
+
+    def map(self, func, iterable, chunksize):
+        """Like Pool.map, but raises TimeoutError once the pool is killed."""
+        pending = self.pool.map_async(func, iterable, chunksize)
+        while not pending.ready():
+            if self.killed.is_set():
+                raise TimeoutError("Worker pool was terminated")
+            pending.wait(0.1)
+        return pending.get()
+
+    def kill(self):
+        """Terminate the workers and wait for them to exit."""
+        with self.lock:
+            self.killed.set()
+            self.pool.terminate()
+            self.pool.join()
+
+
+def kill_pools(owner):
+    """Kill every worker pool held by a probe thread."""
+    with POOLS_LOCK:
+        pools = list(POOLS.get(owner, []))
+    for pool in pools:
+        pool.kill()
+
+
+def compile_sources(paths, jobs=1):
+    """
+    Compile many files in-process, skipping those with current bytecode.
+
+    Compiling is CPU-bound, so stale files are spread over a process pool
+    once there are enough of them to pay for it.
+
+    Returns:
+        List of dicts with path, status ('ok', 'cached' or 'fail'),
+        seconds and error, in the order of paths
+    """
+    results = {}
+    stale = []
+    for path in paths:
+        if bytecode_current(path):
+            results[path] = {'path': path, 'status': 'cached', 'seconds': 0.0, 'error': None}
+        else:
+            stale.append(path)
+
+    if jobs > 1 and len(stale) >= MIN_PARALLEL_FILES:
+        with WorkerPool(jobs) as pool:
+            compiled = pool.map(compile_source, stale,
+                                chunksize=max(1, len(stale) // (jobs * 4)))
+    else:
+        compiled = [compile_source(path) for path in stale]
+
+    for path, error, seconds in compiled:
+        results[path] = {'path': path, 'status': 'fail' if error else 'ok',
+                         'seconds': seconds, 'error': error}
+    return [results[path] for path in paths]
+
+
+@register('python', 'PYTHON ENVIRONMENT')
+def check_python(options):
+    """Check Python environment."""
+    supported = sys.version_info >= MIN_PYTHON
+    minimum = '.'.join(map(str, MIN_PYTHON))
+    return result(
+        [item('ok' if supported else 'fail', 'Version', sys.version.split()[0]),
+         item('ok', 'Executable', sys.executable)],
+        data={'version': sys.version.split()[0], 'executable': sys.executable},
+        recommendations=[] if supported else [f"Upgrade to Python {minimum} or newer"],
+    )
+
+
+@register('structure', 'PROJECT STRUCTURE')
+def check_structure(options):
+    """Check project structure."""
+    items, data = [], {}
+    for d in ['skills', 'packaged-skills', 'skill-zips', '.git']:
         path = Path(d)
-        if path.exists():
-            if path.is_dir():
-                count = len(list(path.iterdir()))
-                print(f"[OK] {d}/ ({count} items)")
-            else:
-                print(f"[OK] {d}")
+        if path.is_dir():
+            # Count without materializing the listing
+            with os.scandir(path) as entries:
+                count = sum(1 for _ in entries)
+            items.append(item('ok', f"{d}/", f"{count} items"))
+            data[d] = count
+        elif path.exists():
+            items.append(item('ok', d))
+            data[d] = None
         else:
-            print(f"[ ] {d} (not found)")
+            items.append(item('missing', d, 'not found'))
+    status = 'fail' if 'skills' not in data else None
+    recommendations = []
+    if 'packaged-skills' not in data:
+        recommendations.append("Run `make package` to build packaged-skills/")
+    if '.git' not in data:
+        recommendations.append("Initialize a git repository (`git init`)")
+    return result(items, data, recommendations, status)
 
 
-def check_skills():
-    """Check custom skills."""
-    print("\nCUSTOM SKILLS:")
-    print("-" * 60)
+@register('scripts', 'SCRIPTS STATUS')
+def check_scripts(options):
+    """Validate Python scripts by compiling them."""
+    results = compile_sources(python_sources('.', recursive=options.compile_all),
+                              options.jobs)
+    items = []
+    for r in results:
+        if options.compile_all and r['status'] == 'cached':
+            continue
+        detail = r['error'] or ('up to date' if r['status'] == 'cached'
+                                else f"{r['seconds'] * 1000:.1f} ms")
+        items.append(item('fail' if r['status'] == 'fail' else 'ok', r['path'], detail))
+    counts = {status: sum(r['status'] == status for r in results)
+              for status in ('ok', 'cached', 'fail')}
+    failed = [r['path'] for r in results if r['status'] == 'fail']
+    return result(
+        items,
+        data={'compiled': counts['ok'], 'cached': counts['cached'], 'failed': counts['fail'],
+              'files': {r['path']: {'status': r['status'], 'seconds': r['seconds'],
+                                    'error': r['error']} for r in results}},
+        recommendations=[f"Fix syntax errors in {', '.join(failed)}"] if failed else [],
+        status='fail' if failed else 'ok',
+    )
 
+
+@register('skills', 'CUSTOM SKILLS')
+def check_skills(options):
+    """Check custom skills."""
     skills_dir = Path('skills')
-    if skills_dir.exists():
-        skills = sorted([d for d in skills_dir.iterdir() if d.is_dir()])
-        for skill in skills:
-            skill_md = skill / 'SKILL.md'
-            status = "[OK]" if skill_md.exists() else "[!]"
-            print(f"{status} {skill.name}")
-    else:
-        print("No skills directory found")
+    if not skills_dir.is_dir():
+        return result([item('fail', 'skills/', 'No skills directory found')])
+    items, incomplete = [], []
+    for skill in sorted(d for d in skills_dir.iterdir() if d.is_dir()):
+        skill_md = skill / 'SKILL.md'
+        if not skill_md.is_file():
+            items.append(item('warn', skill.name, 'no SKILL.md'))
+            incomplete.append(skill.name)
+            continue
+        with open(skill_md, encoding='utf-8') as f:
+            head = [f.readline() for _ in range(10)]
+        has_fields = (any(line.startswith('name:') for line in head)
+                      and any(line.startswith('description:') for line in head))
+        if not head[0].startswith('---') or not has_fields:
+            items.append(item('warn', skill.name, 'SKILL.md frontmatter lacks name/description'))
+            incomplete.append(skill.name)
+        else:
+            items.append(item('ok', skill.name))
+    recommendations = [f"Complete SKILL.md for {', '.join(incomplete)}"] if incomplete else []
+    return result(items, {'skills': len(items)}, recommendations)
 
 
-def check_packages():
-    """Check packaged skills."""
-    print("\nPACKAGED SKILLS:")
-    print("-" * 60)
+@register('packages', 'PACKAGED SKILLS')
+def check_packages(options):
+    """
+    Check packaged skills are present and built from the current sources.
 
+    Uses the same test as package_skills.py: a zip is current when the
+    skill's content hash and the zip's digest match the build manifest,
+    so touching a file without changing it does not make a zip stale.
+    """
     pkg_dir = Path('packaged-skills')
-    if pkg_dir.exists():
-        packages = sorted(pkg_dir.glob('*.zip'))
-        for pkg in packages:
-            size = pkg.stat().st_size / 1024
-            print(f"[OK] {pkg.name:40s} ({size:.1f} KB)")
-    else:
-        print("No packaged-skills directory found")
+    if not pkg_dir.is_dir():
+        return result([item('warn', 'packaged-skills/', 'No packaged-skills directory found')],
+                      recommendations=["Run `make package` to build skill archives"])
+    manifest = load_manifest(pkg_dir)
+    items, data, stale = [], {}, []
+    for pkg in sorted(pkg_dir.glob('*.zip')):
+        size = pkg.stat().st_size
+        source = Path('skills') / pkg.stem
+        entry = manifest.get(pkg.stem) or {}
+        # Zips without a skill directory have nothing to be stale against
+        current = not source.is_dir() or (
+            entry.get('tree_hash') == tree_hash(skill_files(source, source.parent))
+            and entry.get('zip_sha256') == file_digest(pkg))
+        if not current:
+            items.append(item('warn', pkg.name,
+                              f"{size / 1024:.1f} KB, not built from current sources"))
+            stale.append(pkg.stem)
+        else:
+            items.append(item('ok', pkg.name, f"{size / 1024:.1f} KB"))
+        data[pkg.name] = size
+    unpackaged = []
+    if Path('skills').is_dir():
+        unpackaged = sorted(d.name for d in Path('skills').iterdir()
+                            if d.is_dir() and not (pkg_dir / f"{d.name}.zip").exists())
+    items.extend(item('missing', f"{name}.zip", 'not packaged') for name in unpackaged)
+    recommendations = []
+    if stale or unpackaged:
+        recommendations.append(
+            f"Run `make package` to rebuild {', '.join(sorted(stale + unpackaged))}")
+    return result(items, data, recommendations)
 
 
-def check_git():
-    """Check git status."""
-    print("\nGIT STATUS:")
-    print("-" * 60)
+@register('hooks', 'GIT HOOKS')
+def check_hooks(options):
+    """Check the pre-commit hook that setup.py installs."""
+    hook = Path('.git/hooks/pre-commit')
+    if not Path('.git').is_dir():
+        return result([item('warn', 'pre-commit', 'not a git repository')])
+    if hook.is_file() and os.access(hook, os.X_OK):
+        return result([item('ok', 'pre-commit', 'installed')])
+    return result([item('warn', 'pre-commit', 'not installed')],
+                  recommendations=["Run `python setup.py` to install the pre-commit hook"])
+
 
+@register('git', 'GIT STATUS')
+def check_git(options):
+    """Check git status."""
     try:
-        result = subprocess.run(
-            ['git', 'status', '--short'],
+        completed = subprocess.run(
+            ['git', 'status', '--porcelain'],
             capture_output=True,
             text=True,
-            check=True
+            check=True,
+            timeout=options.timeout
         )
-        if result.stdout.strip():
-            print(result.stdout)
+    except (OSError, subprocess.CalledProcessError):
+        return result([item('warn', 'git', 'Git not available or not a repository')])
+    changes = completed.stdout.splitlines()
+    if not changes:
+        return result([item('ok', 'Working directory clean')], {'changes': 0})
+    items = [item('warn', line[3:], line[:2].strip()) for line in changes]
+    return result(items, {'changes': len(changes)},
+                  [f"Commit or stash {len(changes)} uncommitted change(s)"])
+
+
+def run_checks(names, options):
+    """
+    Run probes concurrently, each bounded by options.timeout seconds.
+
+    A probe that raises is reported as 'error' and one that overruns as
+    'timeout'; neither stops the others. Probes run on daemon threads,
+    which cannot be killed but never hold up the process; the worker
+    pools of an overrunning probe are killed, and probes that shell out
+    also pass the timeout to subprocess.
+
+    Returns:
+        {name: result} in the order of names, each with title and duration added
+    """
+    outcomes = {}
+
+    def timed(name):
+        start = time.perf_counter()
+        try:
+            outcome = CHECKS[name]['func'](options)
+        except subprocess.TimeoutExpired:
+            outcome = failed('timeout', f"Did not finish within {options.timeout:g}s")
+        except Exception as e:
+            outcome = failed('error', f"{type(e).__name__}: {e}")
+        outcomes[name] = outcome, time.perf_counter() - start
+
+    started = time.perf_counter()
+    threads = {name: threading.Thread(target=timed, args=(name,), name=f"probe-{name}",
+                                      daemon=True)
+               for name in names}
+    for thread in threads.values():
+        thread.start()
+
+    results = {}
+    for name, thread in threads.items():
+        thread.join(max(0.0, started + options.timeout - time.perf_counter()))
+        if name in outcomes:
+            outcome, duration = outcomes[name]
         else:
-            print("[OK] Working directory clean")
-    except Exception as e:
-        print(f"[!] Git not available or not a repository")
+            kill_pools(thread.name)
+            outcome = failed('timeout', f"Did not finish within {options.timeout:g}s")
+            duration = time.perf_counter() - started
+        outcome.setdefault('error', None)
+        results[name] = dict(outcome, title=CHECKS[name]['title'], duration=duration)
+    return results
 
 
-def main():
-    """Run health check."""
+def print_report(report):
+    """Print the report as text."""
     print("=" * 60)
     print("PROJECT HEALTH CHECK - my-claude-tools")
-    print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Generated: {report['generated']}")
     print("=" * 60)
 
-    check_python()
-    check_structure()
-    check_scripts()
-    check_skills()
-    check_packages()
-    check_git()
+    for name, check in report['checks'].items():
+        print(f"\n{check['title']}: {LABELS[check['status']]} "
+              f"({check['duration'] * 1000:.1f} ms)")
+        print("-" * 60)
+        if check['error']:
+            print(f"{LABELS[check['status']]} {check['error']}")
+        for line in check['items']:
+            detail = f" ({line['detail']})" if line['detail'] else ''
+            print(f"{LABELS[line['status']]} {line['name']}{detail}")
 
     print("\n" + "=" * 60)
     print("RECOMMENDATIONS:")
     print("-" * 60)
-    print("[OK] Development environment configured")
-    print("[OK] Pre-commit hooks installed")
-    print("[OK] All scripts validated")
-    print("[OK] Skills packaged and ready")
-    print("[OK] Documentation complete")
+    if report['recommendations']:
+        for recommendation in report['recommendations']:
+            print(f"[!] {recommendation}")
+    else:
+        print("[OK] Nothing to do")
+    print(f"\nOverall: {LABELS[report['status']]} in {report['duration']:.2f}s")
     print("=" * 60)
 
 
+def main():
+    """Run health check."""
+    parser = argparse.ArgumentParser(description="Project health check")
+    parser.add_argument("--compile-all", action="store_true",
+                        help="Compile every Python source in the tree, including "
+                             "skills/**/scripts, not just top-level scripts")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for compiling (default: one per CPU)")
+    parser.add_argument("--only", help=f"Comma-separated checks to run "
+                                       f"(available: {', '.join(CHECKS)})")
+    parser.add_argument("--timeout", type=float, default=30,
+                        help="Seconds each check may take (default: 30)")
+    parser.add_argument("--json", action="store_true",
+                        help="Print a JSON report")
+    args = parser.parse_args()
+
+    names = list(CHECKS)
+    if args.only:
+        names = [n.strip() for n in args.only.split(',') if n.strip()]
+        unknown = [n for n in names if n not in CHECKS]
+        if unknown:
+            parser.error(f"unknown check(s): {', '.join(unknown)}")
+
+    start = time.perf_counter()
+    checks = run_checks(names, args)
+    report = {
+        'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'status': worst(check['status'] for check in checks.values()),
+        'duration': time.perf_counter() - start,
+        'checks': checks,
+        'recommendations': [r for check in checks.values() for r in check['recommendations']],
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 1 if report['status'] in ('fail', 'timeout', 'error') else 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
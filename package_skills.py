@@ -3,9 +3,13 @@
 Package custom skills into distributable zip files.
 """
 
-import zipfile
+import argparse
+import os
 from pathlib import Path
-import shutil
+
+from zip_builder import (
+    LARGE_TEXT_METHODS, build_zip, load_manifest, run_jobs, save_manifest,
+)
 
 
 def validate_skill(skill_path):
@@ -27,8 +31,21 @@ def validate_skill(skill_path):
     return True, "OK"
 
 
-def package_skill(skill_path, output_dir):
-    """Package a skill into a zip file."""
+def package_skill(skill_path, output_dir, manifest=None, force=False,
+                  large_text=None):
+    """
+    Package a skill into a zip file.
+
+    When a manifest is given, the skill is skipped if its content hash and
+    the existing zip both match the last recorded build.
+
+    Args:
+        skill_path: Skill directory to package
+        output_dir: Directory receiving the zip
+        manifest: Build manifest dict, updated in place
+        force: Rebuild even if the skill is unchanged
+        large_text: Optional "lzma" or "bzip2" for large text files
+    """
     skill_name = skill_path.name
     zip_path = output_dir / f"{skill_name}.zip"
 
@@ -37,21 +54,38 @@ def package_skill(skill_path, output_dir):
     if not valid:
         return False, message
 
-    # Create zip file
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for file in skill_path.rglob('*'):
-            if file.is_file():
-                arcname = file.relative_to(skill_path.parent)
-                zipf.write(file, arcname)
+    previous = manifest.get(skill_name) if manifest is not None else None
+    message, entry = build_zip(skill_path, zip_path, skill_path.parent,
+                               previous, force=force or manifest is None,
+                               large_text=large_text)
+
+    if manifest is not None:
+        manifest[skill_name] = entry
 
-    # Get file count
-    file_count = len(list(skill_path.rglob('*')))
+    return True, message
 
-    return True, f"OK ({file_count} files)"
+
+def _package_job(skill_path, output_dir, previous, force, large_text):
+    """Pool entry point: package one skill and return its manifest entry."""
+    manifest = {skill_path.name: previous} if previous else {}
+    success, message = package_skill(skill_path, output_dir, manifest, force,
+                                     large_text)
+    return success, message, manifest.get(skill_path.name)
 
 
 def main():
     """Package all custom skills."""
+    parser = argparse.ArgumentParser(description="Package custom skills")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild every skill even if unchanged")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Package skills in parallel on N processes "
+                             "(0 = one per CPU; default: 1)")
+    parser.add_argument("--large-text", choices=sorted(LARGE_TEXT_METHODS),
+                        help="Compress text files over 1 MiB with LZMA or bzip2")
+    args = parser.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
+
     skills_dir = Path("skills")
     output_dir = Path("packaged-skills")
 
@@ -70,15 +104,23 @@ def main():
         print("ERROR: No skills found in skills/ directory")
         return 1
 
+    manifest = load_manifest(output_dir)
+    jobs_args = [(skill_path, output_dir, manifest.get(skill_path.name),
+                  args.force, args.large_text)
+                 for skill_path in skills]
     results = []
-    for skill_path in skills:
+    for skill_path, (success, message, entry) in zip(
+            skills, run_jobs(_package_job, jobs_args, jobs)):
         skill_name = skill_path.name
-        success, message = package_skill(skill_path, output_dir)
+        if entry is not None:
+            manifest[skill_name] = entry
 
         status = "[OK]" if success else "[FAIL]"
         print(f"{status} {skill_name:30s} {message}")
         results.append(success)
 
+    save_manifest(output_dir, manifest)
+
     print()
     success_count = sum(results)
     total_count = len(results)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Pre-commit checks on staged content.
+
+Checks exactly what is about to be committed - the blobs in the git
+index, not the working tree - in a single Python process: Python files
+are compiled and linted with the team rules, and SKILL.md files must
+start with name/description frontmatter. Results are cached by blob SHA
+in the git directory, so content that was already checked is skipped.
+
+setup.py installs a hook that runs this script.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path[:0] = [str(ROOT), str(ROOT / 'skills' / 'code-standards-checker' / 'scripts')]
+
+import custom_checker  # noqa: F401  (registers the team rules)
+from check_standards import file_digest
+from rule_engine import check_source, rules_fingerprint
+from verify_skills import FRONTMATTER_LINES
+
+# Team rules that flag bugs rather than style, so they are safe to enforce
+LINT_RULES = ['T001', 'T002', 'T004', 'T005']
+CACHE_NAME = 'precommit-cache.json'
+# Bump when the checks change so older results are not trusted
+CACHE_VERSION = 1
+# Results kept in the cache; the least recently used are dropped first
+MAX_ENTRIES = 5000
+# Diffing against the empty tree lists everything staged for a first commit
+EMPTY_TREE = '4b825dc642cb6eb9a060e54bf8d69288fbee4904'
+# Regular files only; symlinks (120000) and submodules (160000) are skipped
+FILE_MODES = {'100644', '100755'}
+
+
+def git(*args, stdin=None):
+    """Run git and return its stdout as bytes, raising on failure."""
+    return subprocess.run(['git', *args], input=stdin, capture_output=True,
+                          check=True).stdout
+
+
+def staged_blobs():
+    """
+    Files added or modified in the index.
+
+    Returns:
+        List of (path, blob SHA) pairs; the SHA names the staged content
+    """
+    args = ['diff-index', '--cached', '-z', '--no-renames', '--diff-filter=AM']
+    try:
+        output = git(*args, 'HEAD')
+    except subprocess.CalledProcessError:
+        output = git(*args, EMPTY_TREE)
+
+    fields = output.decode('utf-8', errors='surrogateescape').split('\0')
+    staged = []
+    # -z output alternates ":oldmode newmode oldsha newsha status" and a path
+    for meta, path in zip(fields[0::2], fields[1::2]):
+        _, new_mode, _, sha, _ = meta[1:].split(' ')
+        if new_mode in FILE_MODES:
+            staged.append((path, sha))
+    return staged
+
+
+def read_blobs(shas):
+    """Contents of many blobs via one `git cat-file --batch` call."""
+    shas = sorted(set(shas))
+    if not shas:
+        return {}
+    output = git('cat-file', '--batch', stdin=''.join(f'{sha}\n' for sha in shas).encode())
+    blobs = {}
+    pos = 0
+    for sha in shas:
+        header_end = output.index(b'\n', pos)
+        size = int(output[pos:header_end].split()[2])
+        blobs[sha] = output[header_end + 1:header_end + 1 + size]
+        # Each object is followed by a newline
+        pos = header_end + 1 + size + 1
+    return blobs
+
+
+def check_python(data):
+    """Syntax and lint problems in Python source, as 'line:col: message' strings."""
+    try:
+        source = data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        return [f"1:1: E902 Not valid UTF-8 ({e.reason})"]
+    try:
+        # compile() also catches errors ast.parse lets through, e.g. return outside a function
+        compile(source, '<staged>', 'exec', dont_inherit=True)
+    except (SyntaxError, ValueError) as e:
+        line, col = getattr(e, 'lineno', None) or 1, getattr(e, 'offset', None) or 1
+        return [f"{line}:{col}: E999 {type(e).__name__}: {getattr(e, 'msg', e)}"]
+    violations = check_source(source, '<staged>', LINT_RULES)['violations']
+    return [f"{v['line']}:{v['col']}: {v['code']} {v['message']}" for v in violations]
+
+
+def check_frontmatter(data):
+    """Problems with a SKILL.md's YAML frontmatter (same rules as verify_skills)."""
+    lines = data.decode('utf-8', errors='replace').splitlines()[:FRONTMATTER_LINES]
+    if not lines or not lines[0].startswith('---'):
+        return ["1:1: Missing YAML frontmatter"]
+    missing = [field for field in ('name', 'description')
+               if not any(f'{field}:' in line for line in lines)]
+    if missing:
+        return [f"1:1: Frontmatter lacks {' and '.join(missing)}"]
+    return []
+
+
+def checker_for(path):
+    """Name of the check that applies to a path, or None."""
+    if path.endswith('.py'):
+        return 'python'
+    if os.path.basename(path) == 'SKILL.md':
+        return 'frontmatter'
+    return None
+
+
+CHECKERS = {'python': check_python, 'frontmatter': check_frontmatter}
+
+
+def checks_fingerprint():
+    """Hash of this script and the lint rules; results are only reused while it holds."""
+    hasher = hashlib.sha256(rules_fingerprint(LINT_RULES, {}, ['custom_checker']).encode())
+    hasher.update(file_digest(__file__).encode())
+    hasher.update(file_digest(ROOT / 'verify_skills.py').encode())
+    return hasher.hexdigest()
+
+
+class BlobCache:
+    """
+    Check results keyed by check name and blob SHA.
+
+    A blob SHA names its content, so a result stays valid for as long as
+    the checks are unchanged; the whole cache is dropped when their
+    fingerprint changes.
+    """
+
+    def __init__(self, cache_path, context):
+        """Load the cache, ignoring it if missing, stale or unreadable."""
+        self.cache_path = Path(cache_path)
+        self.context = context
+        self.entries = {}
+        try:
+            data = json.loads(self.cache_path.read_text(encoding='utf-8'))
+            if data.get('version') == CACHE_VERSION and data.get('context') == context:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, key):
+        """Cached problems for a key, or None."""
+        problems = self.entries.pop(key, None)
+        if problems is not None:
+            # Re-insert so recently used entries survive trimming
+            self.entries[key] = problems
+        return problems
+
+    def put(self, key, problems):
+        """Remember the problems found for a key."""
+        self.entries[key] = problems
+
+    def save(self):
+        """Keep the most recently used entries and atomically write the cache."""
+        entries = dict(list(self.entries.items())[-MAX_ENTRIES:])
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        tmp_path.write_text(
+            json.dumps({'version': CACHE_VERSION, 'context': self.context,
+                        'entries': entries}),
+            encoding='utf-8'
+        )
+        os.replace(tmp_path, self.cache_path)
+
+
+def check_staged(cache=None):
+    """
+    Check every staged file that a check applies to.
+
+    Returns:
+        ({path: [problems]} for files with problems, number of files checked)
+    """
+    targets = [(path, sha, checker_for(path)) for path, sha in staged_blobs()]
+    targets = [t for t in targets if t[2]]
+
+    results = {}
+    for path, sha, check in targets:
+        cached = cache.get(f'{check}:{sha}') if cache is not None else None
+        if cached is not None:
+            results[path] = cached
+    blobs = read_blobs(sha for path, sha, _ in targets if path not in results)
+
+    for path, sha, check in targets:
+        if path not in results:
+            results[path] = CHECKERS[check](blobs[sha])
+            if cache is not None:
+                cache.put(f'{check}:{sha}', results[path])
+    return {path: problems for path, problems in results.items() if problems}, len(targets)
+
+
+def main():
+    """Run the checks; a non-zero exit status aborts the commit."""
+    start = time.perf_counter()
+    git_dir = os.environ.get('GIT_DIR') or git('rev-parse', '--git-dir').decode().strip()
+    cache = BlobCache(Path(git_dir) / CACHE_NAME, checks_fingerprint())
+    problems, checked = check_staged(cache)
+    cache.save()
+    elapsed = time.perf_counter() - start
+
+    for path in sorted(problems):
+        for problem in problems[path]:
+            print(f"{path}:{problem}")
+    if problems:
+        count = sum(len(p) for p in problems.values())
+        print(f"\n[FAIL] {count} problem(s) in {len(problems)} of {checked} staged "
+              f"file(s) ({elapsed:.2f}s)")
+        print("Fix them and re-stage, or commit with --no-verify to skip the checks.")
+        return 1
+    print(f"[OK] {checked} staged file(s) passed pre-commit checks ({elapsed:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
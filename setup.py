@@ -53,19 +53,24 @@ def main():
         hook_dir.mkdir(exist_ok=True)
 
         pre_commit_hook = hook_dir / "pre-commit"
-        pre_commit_content = """#!/bin/bash
-# Pre-commit hook for my-claude-tools
-
-echo "Running pre-commit checks..."
-
-# Check Python syntax
-python -m py_compile *.py 2>/dev/null
-if [ $? -ne 0 ]; then
-    echo "Python syntax errors found!"
-    exit 1
-fi
+        pre_commit_content = """#!/usr/bin/env python3
+# Pre-commit hook for my-claude-tools (generated by setup.py)
+#
+# Checks the staged contents of Python files and SKILL.md in one
+# process, caching results by blob SHA; see precommit.py.
+import os
+import sys
 
-echo "Pre-commit checks passed!"
+# Git runs hooks from the top of the working tree
+sys.path.insert(0, os.getcwd())
+try:
+    from precommit import main
+except ModuleNotFoundError as e:
+    if e.name != "precommit":
+        raise
+    print("precommit.py not found; skipping pre-commit checks")
+    sys.exit(0)
+sys.exit(main())
 """
         pre_commit_hook.write_text(pre_commit_content)
         pre_commit_hook.chmod(0o755)
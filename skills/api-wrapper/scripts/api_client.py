@@ -5,8 +5,20 @@ Base API client with authentication and error handling.
 
 import os
 import requests
+import sys
 import time
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Optional, Callable, Dict, Any, Iterator, List, Tuple, Union
+from urllib.parse import urlsplit
+
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
+from response_parser import extract_items, get_path, iter_json_array
+from metrics import ClientMetrics
+from retry_policy import CircuitOpenError, RetryPolicy
+
+HOOK_EVENTS = ('before_request', 'retry', 'after_request')
 
 
 class APIClient:
@@ -17,7 +29,13 @@ class APIClient:
         base_url: str,
         api_key: Optional[str] = None,
         timeout: int = 30,
-        max_retries: int = 3
+        max_retries: int = 3,
+        pool_size: int = 10,
+        keep_alive: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        metrics: Optional[ClientMetrics] = None
     ):
         """
         Initialize API client.
@@ -26,17 +44,64 @@ class APIClient:
             base_url: Base URL for the API
             api_key: API key for authentication
             timeout: Request timeout in seconds
-            max_retries: Maximum number of retries for failed requests
+            max_retries: Maximum attempts per request when no retry_policy
+                is given
+            pool_size: Maximum pooled connections per host; also the
+                default concurrency for batch()
+            keep_alive: Reuse connections between requests
+            rate_limiter: Optional RateLimiter paced before every attempt
+                and updated from each response's rate-limit headers; may be
+                shared between clients
+            cache: Optional ResponseCache for GET responses
+            retry_policy: Optional RetryPolicy (backoff, retry budget and
+                circuit breakers); defaults to one of max_retries attempts
+            metrics: Optional ClientMetrics fed by an after_request hook
         """
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key or os.getenv('API_KEY')
         self.timeout = timeout
         self.max_retries = max_retries
+        self.pool_size = pool_size
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=max_retries)
+        self.metrics = metrics
+        self.hooks = {event: [] for event in HOOK_EVENTS}
+        if metrics is not None:
+            self.add_hook('after_request', metrics.observe)
         self.session = requests.Session()
 
+        # Size the connection pool so concurrent batch() workers never
+        # have to open and discard extra connections
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
         if self.api_key:
             self.session.headers.update({'Authorization': f'Bearer {self.api_key}'})
 
+    def add_hook(self, event: str, func: Callable[[Dict[str, Any]], None]):
+        """
+        Register a callback for request instrumentation.
+
+        Every callback receives the same event dict for one logical request
+        (all its attempts), with keys method, url and headers:
+        - before_request: before the first attempt; may add headers
+        - retry: before each retry, with retries, retry_reason, retry_delay
+        - after_request: once the request finished or failed, adding
+          status (None without a response), seconds, retries, bytes_sent,
+          bytes_received and error (the exception raised, or None)
+
+        Args:
+            event: One of 'before_request', 'retry', 'after_request'
+            func: Callback taking the event dict
+        """
+        if event not in self.hooks:
+            raise ValueError(f"Unknown hook event: {event}")
+        self.hooks[event].append(func)
+
     def request(
         self,
         method: str,
@@ -61,34 +126,344 @@ class APIClient:
         Raises:
             requests.HTTPError: For HTTP errors
             requests.Timeout: For timeout errors
+            requests.ConnectionError: If the host cannot be reached
+            CircuitOpenError: If the host's circuit breaker is open
         """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        return self._request(method, endpoint, params, json, headers)[0]
 
-        for attempt in range(self.max_retries):
+    def _url(self, endpoint: str) -> str:
+        """Resolve an endpoint path; absolute URLs (e.g. from Link headers) pass through."""
+        if endpoint.startswith(('http://', 'https://')):
+            return endpoint
+        return f"{self.base_url}/{endpoint.lstrip('/')}"
+
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        json: Optional[Dict] = None,
+        headers: Optional[Dict] = None
+    ) -> Tuple[Any, Dict[str, Dict[str, str]]]:
+        """Like request(), but returns (data, links) with the parsed Link header."""
+        url = self._url(endpoint)
+
+        cache_key = cached = None
+        if self.cache is not None and method.upper() == 'GET':
+            # Key on the credential too so clients sharing a cache never
+            # see each other's responses
+            auth = self.session.headers.get('Authorization', '')
+            cache_key = self.cache.make_key(method, url, params, vary=auth)
+            cached, fresh = self.cache.lookup(cache_key)
+            if fresh:
+                return self.cache.decode(cached)
+            if cached is not None:
+                headers = {**(headers or {}), **self.cache.conditional_headers(cached)}
+
+        response = self._send(method, url, params=params, json=json, headers=headers)
+        if cached is not None and response.status_code == 304:
+            return self.cache.revalidated(cache_key, cached, response.headers)
+        data = response.json()
+        if cache_key is not None:
+            self.cache.store(cache_key, response.headers, response.text,
+                             len(response.content), links=response.links)
+        return data, response.links
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        json: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        stream: bool = False
+    ) -> requests.Response:
+        """Send a request through _attempt(), running hooks around it."""
+        hooks = self.hooks
+        if not (hooks['before_request'] or hooks['retry'] or hooks['after_request']):
+            # No instrumentation: skip building the event entirely
+            return self._attempt(method, url, params, json, headers, stream)
+
+        event = {'method': method.upper(), 'url': url,
+                 'headers': dict(headers or {}), 'retries': 0}
+        for hook in hooks['before_request']:
+            hook(event)
+        response = error = None
+        start = time.perf_counter()
+        try:
+            response = self._attempt(method, url, params, json, event['headers'],
+                                     stream, event)
+            return response
+        except Exception as e:
+            error = e
+            response = getattr(e, 'response', None)
+            raise
+        finally:
+            event['seconds'] = time.perf_counter() - start
+            event['error'] = error
+            event['status'] = response.status_code if response is not None else None
+            event['bytes_sent'] = 0
+            event['bytes_received'] = 0
+            if response is not None:
+                event['bytes_sent'] = len(response.request.body or b'')
+                if stream:
+                    # Reading content would consume the stream
+                    length = response.headers.get('Content-Length', '')
+                    event['bytes_received'] = int(length) if length.isdigit() else 0
+                else:
+                    event['bytes_received'] = len(response.content)
+            for hook in hooks['after_request']:
+                hook(event)
+
+    def _attempt(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        json: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        stream: bool = False,
+        event: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        """
+        Send one request, retrying as the retry policy allows.
+
+        Connection errors, timeouts and retryable statuses (5xx, 429) are
+        retried after a jittered delay that honors Retry-After. Failures
+        count toward the host's circuit breaker; while it is open,
+        CircuitOpenError is raised without contacting the host.
+
+        Returns:
+            The response, for any status below 400 (including 304)
+
+        Raises:
+            requests.HTTPError: For HTTP errors that are not retried
+            requests.RequestException: For the last connection error or timeout
+            CircuitOpenError: If the host's circuit is open
+        """
+        policy = self.retry_policy
+        host = urlsplit(url).netloc
+        breaker = policy.breaker(host)
+        policy.budget.record_request()
+        previous = 0.0
+        attempt = 0
+
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(
+                    f"Circuit open for {host}; retry in {breaker.retry_in():.1f}s"
+                )
             try:
+                if self.rate_limiter:
+                    self.rate_limiter.acquire()
                 response = self.session.request(
                     method=method,
                     url=url,
                     params=params,
                     json=json,
                     headers=headers,
-                    timeout=self.timeout
+                    timeout=self.timeout,
+                    stream=stream
                 )
-                response.raise_for_status()
-                return response.json()
-
-            except requests.Timeout:
-                if attempt == self.max_retries - 1:
+            except (requests.ConnectionError, requests.Timeout) as e:
+                breaker.record_failure()
+                delay = None
+                # Once the circuit opens, surface this error rather than retry
+                if breaker.state != 'open':
+                    delay = policy.retry_delay(method, attempt, previous)
+                if delay is None:
                     raise
-                print(f"⚠️  Timeout, retrying... ({attempt + 1}/{self.max_retries})")
-                time.sleep(2 ** attempt)
-
-            except requests.HTTPError as e:
-                if e.response.status_code >= 500 and attempt < self.max_retries - 1:
-                    print(f"⚠️  Server error, retrying... ({attempt + 1}/{self.max_retries})")
-                    time.sleep(2 ** attempt)
+                reason = "Timeout" if isinstance(e, requests.Timeout) else "Connection error"
+            except BaseException:
+                # No verdict on the host (including an interrupted rate limit
+                # wait), but a half-open trial must not stay in flight or the
+                # host would be rejected forever
+                breaker.release()
+                raise
+            else:
+                if response.status_code >= 500:
+                    breaker.record_failure()
                 else:
+                    breaker.record_success()
+                if self.rate_limiter:
+                    self.rate_limiter.update_from_headers(response.headers)
+                if response.ok:
+                    return response
+
+                delay = None
+                if breaker.state != 'open':
+                    delay = policy.retry_delay(method, attempt, previous, response)
+                if delay is None:
+                    response.raise_for_status()
+                reason = ("Rate limited" if response.status_code == 429
+                          else f"Server error {response.status_code}")
+                response.close()
+
+            attempt += 1
+            previous = delay
+            if event is not None:
+                event.update(retries=attempt, retry_reason=reason, retry_delay=delay)
+                for hook in self.hooks['retry']:
+                    hook(event)
+            # Diagnostics go to stderr so stdout stays clean for program output
+            print(f"⚠️  {reason}, retrying in {delay:.2f}s... "
+                  f"({attempt}/{policy.max_attempts - 1})", file=sys.stderr)
+            time.sleep(delay)
+
+    def batch(
+        self,
+        calls: List[Union[Dict[str, Any], tuple]],
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Issue many requests concurrently over the shared connection pool.
+
+        Each call goes through request(), so retries and authentication
+        behave exactly as for a single request. At most `concurrency`
+        requests are in flight at once.
+
+        Args:
+            calls: Request specs, either (method, endpoint) tuples or dicts
+                of request() keyword arguments
+            concurrency: Maximum requests in flight (default: pool_size)
+            return_exceptions: Return exceptions in place of results
+                instead of raising the first one
+
+        Returns:
+            Parsed JSON responses in the same order as calls
+        """
+        def run(call):
+            try:
+                if isinstance(call, dict):
+                    return self.request(**call)
+                return self.request(*call)
+            except Exception as e:
+                if not return_exceptions:
                     raise
+                return e
+
+        workers = max(1, min(concurrency or self.pool_size, len(calls) or 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run, calls))
+
+    def paginate(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        items_key: Optional[str] = None,
+        strategy: str = 'link',
+        cursor_param: str = 'cursor',
+        cursor_field: str = 'next_cursor',
+        offset_param: str = 'offset',
+        limit_param: str = 'limit',
+        page_size: int = 100,
+        max_pages: Optional[int] = None,
+        prefetch: bool = True
+    ) -> Iterator[Any]:
+        """
+        Iterate over every record of a paginated GET endpoint.
+
+        Pages are fetched through request(), so retries, rate limiting and
+        caching apply to each one. With prefetch, the next page is requested
+        on a background thread as soon as its address is known, overlapping
+        the network round trip with the caller's processing of the current
+        page. Only the current and the next page are held in memory.
+
+        Args:
+            endpoint: API endpoint path of the first page
+            params: Query parameters for the first page
+            items_key: Dotted path to the records in each page body
+                (not needed when pages are bare arrays)
+            strategy: 'link' (follow the Link rel="next" header), 'cursor'
+                (send the body's cursor_field back as cursor_param) or
+                'offset' (advance offset_param by page_size)
+            cursor_param: Query parameter that carries the cursor
+            cursor_field: Dotted path to the next cursor in the page body
+            offset_param: Query parameter for the offset
+            limit_param: Query parameter for the page size (offset strategy)
+            page_size: Records per page (offset strategy)
+            max_pages: Stop after this many pages
+            prefetch: Fetch the next page while the current one is consumed
+
+        Yields:
+            Records from each page, in order
+        """
+        if strategy not in ('link', 'cursor', 'offset'):
+            raise ValueError(f"Unknown pagination strategy: {strategy}")
+
+        params = dict(params or {})
+        if strategy == 'offset':
+            params.setdefault(offset_param, 0)
+            params[limit_param] = page_size
+
+        def next_page(page_params, data, links, items):
+            # Address of the following page, or None after the last one
+            if strategy == 'link':
+                url = links.get('next', {}).get('url')
+                # The Link URL already carries the query string
+                return (url, None) if url else None
+            if strategy == 'cursor':
+                cursor = get_path(data, cursor_field)
+                return (endpoint, {**page_params, cursor_param: cursor}) if cursor else None
+            if len(items) < page_size:
+                return None
+            offset = int(page_params[offset_param]) + len(items)
+            return (endpoint, {**page_params, offset_param: offset})
+
+        def fetch(page):
+            return self._request('GET', page[0], params=page[1])
+
+        pool = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        page = (endpoint, params)
+        pending = pool.submit(fetch, page) if pool else None
+        pages = 0
+        try:
+            while page is not None:
+                data, links = pending.result() if pool else fetch(page)
+                items = extract_items(data, items_key)
+                pages += 1
+
+                page = next_page(page[1] or {}, data, links, items)
+                if max_pages is not None and pages >= max_pages:
+                    page = None
+                if pool and page is not None:
+                    pending = pool.submit(fetch, page)
+
+                yield from items
+        finally:
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    def stream(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        items_key: Optional[str] = None,
+        chunk_size: int = 64 * 1024
+    ) -> Iterator[Any]:
+        """
+        Yield the records of a large JSON array response as it downloads.
+
+        The body is never buffered whole: it is read in chunk_size pieces
+        and decoded one element at a time, so memory stays flat however
+        many records an export contains. Responses are not cached.
+
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters
+            items_key: Key of the array when the body is an object wrapping
+                it (e.g. {"data": [...]}); the first occurrence is streamed
+            chunk_size: Bytes read from the socket at a time
+
+        Yields:
+            Array elements, in order
+        """
+        response = self._send('GET', self._url(endpoint), params=params, stream=True)
+        with response:
+            yield from iter_json_array(response.iter_content(chunk_size),
+                                       key=items_key,
+                                       encoding=response.encoding or 'utf-8')
 
     def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
         """Make a GET request."""
@@ -109,10 +484,11 @@ class APIClient:
 
 # Example usage
 if __name__ == "__main__":
-    # Example: GitHub API client
+    # Example: GitHub API client, paced to stay under its rate limit
     client = APIClient(
         base_url="https://api.github.com",
-        api_key=os.getenv('GITHUB_TOKEN')
+        api_key=os.getenv('GITHUB_TOKEN'),
+        rate_limiter=RateLimiter(rate=10)
     )
 
     try:
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark serial vs concurrent APIClient requests against a local stub server.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from api_client import APIClient
+
+
+def make_handler(latency):
+    """Build a request handler that answers every GET after `latency` seconds."""
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like a real API
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(latency)
+            body = json.dumps({"path": self.path}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+class StubServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops connections under high concurrency
+    request_queue_size = 128
+
+
+def start_stub_server(latency):
+    """Start the stub server on a free local port; returns (server, base_url)."""
+    server = StubServer(("127.0.0.1", 0), make_handler(latency))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}"
+
+
+def main():
+    """Compare request throughput for serial calls and batch()."""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--requests", type=int, default=200,
+                        help="Number of requests per run (default: 200)")
+    parser.add_argument("--latency-ms", type=float, default=20,
+                        help="Simulated server latency in ms (default: 20)")
+    parser.add_argument("--concurrency", default="1,4,16,32",
+                        help="Comma-separated batch() concurrency levels")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.latency_ms / 1000)
+    endpoints = [f"/items/{i}" for i in range(args.requests)]
+
+    try:
+        print(f"{args.requests} requests, {args.latency_ms:.0f} ms server latency\n")
+        print(f"{'Mode':<20} {'Seconds':>10} {'Req/s':>10} {'Speedup':>9}")
+        print("-" * 52)
+
+        client = APIClient(base_url)
+        start = time.perf_counter()
+        for endpoint in endpoints:
+            client.get(endpoint)
+        serial = time.perf_counter() - start
+        print(f"{'serial':<20} {serial:>10.3f} {args.requests / serial:>10.1f} {1:>8.2f}x")
+
+        for level in (int(c) for c in args.concurrency.split(",")):
+            client = APIClient(base_url, pool_size=level)
+            start = time.perf_counter()
+            client.batch([("GET", endpoint) for endpoint in endpoints])
+            elapsed = time.perf_counter() - start
+            label = f"batch x{level}"
+            print(f"{label:<20} {elapsed:>10.3f} {args.requests / elapsed:>10.1f} "
+                  f"{serial / elapsed:>8.2f}x")
+    finally:
+        server.shutdown()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Request metrics for APIClient: latency histograms, counters and Prometheus export.
+"""
+
+import bisect
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+# Latency buckets grow by 2**0.25 (~19%) from 0.5 ms to about 70 s, which
+# keeps percentile estimates within a few percent at a fixed memory cost
+BUCKET_MIN = 0.0005
+BUCKET_FACTOR = 2 ** 0.25
+BUCKET_COUNT = 69
+BUCKET_BOUNDS = [BUCKET_MIN * BUCKET_FACTOR ** i for i in range(BUCKET_COUNT)]
+PERCENTILES = (0.5, 0.95, 0.99)
+
+# Path segments that identify a resource rather than an endpoint
+ID_SEGMENT = re.compile(
+    r'^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+    r'|[0-9a-fA-F]{24,})$'
+)
+
+
+def endpoint_label(url: str) -> str:
+    """
+    Reduce a request URL to an endpoint label such as "/users/:id/repos".
+
+    Numeric, UUID and long hex path segments are replaced with ":id" so
+    each endpoint gets one time series rather than one per resource.
+    """
+    path = urlsplit(url).path or '/'
+    return '/'.join(':id' if ID_SEGMENT.match(part) else part
+                    for part in path.split('/'))
+
+
+class Histogram:
+    """Fixed-bucket latency histogram with percentile estimates."""
+
+    def __init__(self):
+        self.counts = [0] * (BUCKET_COUNT + 1)  # last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        """Record one duration."""
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate the q-th quantile (0 < q <= 1).
+
+        Interpolates linearly inside the bucket that holds the quantile and
+        never reports more than the largest observed value.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = BUCKET_BOUNDS[i - 1] if i else 0.0
+                upper = BUCKET_BOUNDS[i] if i < BUCKET_COUNT else self.max
+                value = lower + (upper - lower) * (rank - seen) / n
+                return min(value, self.max)
+            seen += n
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, max and the standard percentiles, in seconds."""
+        result = {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+            'max': round(self.max, 6),
+        }
+        for q in PERCENTILES:
+            result[f"p{round(q * 100)}"] = round(self.percentile(q), 6)
+        return result
+
+
+def _labels(**labels) -> str:
+    """Format Prometheus labels, escaping values."""
+    parts = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+class ClientMetrics:
+    """
+    Aggregates APIClient request events.
+
+    Register with APIClient(metrics=...) or add observe() as an
+    after_request hook. Per (method, endpoint) it keeps a latency
+    histogram, request counts by status, retry and error counts, and
+    bytes sent and received. Thread-safe; one instance can be shared by
+    several clients.
+    """
+
+    def __init__(self, label: Callable[[str], str] = endpoint_label):
+        """
+        Initialize metrics.
+
+        Args:
+            label: Maps a request URL to its endpoint label
+        """
+        self.label = label
+        self._lock = threading.Lock()
+        self._latency: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+        self._requests: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self._retries: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._errors: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self._bytes_sent: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._bytes_received: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def observe(self, event: Dict[str, Any]):
+        """Record one completed request (an APIClient after_request event)."""
+        key = (event['method'], self.label(event['url']))
+        status = event.get('status')
+        error = event.get('error')
+        kind = None
+        if status is not None and status >= 400:
+            kind = f"{status // 100}xx"
+        elif error is not None:
+            kind = type(error).__name__
+
+        with self._lock:
+            self._latency[key].observe(event['seconds'])
+            self._requests[key + (str(status) if status is not None else 'none',)] += 1
+            if event.get('retries'):
+                self._retries[key] += event['retries']
+            if kind:
+                self._errors[key + (kind,)] += 1
+            self._bytes_sent[key] += event.get('bytes_sent', 0)
+            self._bytes_received[key] += event.get('bytes_received', 0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Snapshot of all metrics.
+
+        Returns:
+            {"endpoints": {"GET /users/:id": {...}}, "totals": {...}} where
+            each endpoint has latency percentiles (seconds), requests by
+            status, retries, errors by kind and bytes transferred
+        """
+        with self._lock:
+            endpoints = {}
+            for key, histogram in sorted(self._latency.items()):
+                endpoints[' '.join(key)] = {
+                    'latency': histogram.summary(),
+                    'requests': {s: n for (m, e, s), n in self._requests.items()
+                                 if (m, e) == key},
+                    'retries': self._retries.get(key, 0),
+                    'errors': {k: n for (m, e, k), n in self._errors.items()
+                               if (m, e) == key},
+                    'bytes_sent': self._bytes_sent.get(key, 0),
+                    'bytes_received': self._bytes_received.get(key, 0),
+                }
+            totals = {
+                'requests': sum(self._requests.values()),
+                'retries': sum(self._retries.values()),
+                'errors': sum(self._errors.values()),
+                'bytes_sent': sum(self._bytes_sent.values()),
+                'bytes_received': sum(self._bytes_received.values()),
+            }
+        return {'endpoints': endpoints, 'totals': totals}
+
+    def to_prometheus(self, prefix: str = 'api_client') -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        with self._lock:
+            family('requests_total', 'counter', 'Completed requests')
+            for (method, endpoint, status), n in sorted(self._requests.items()):
+                labels = _labels(method=method, endpoint=endpoint, status=status)
+                lines.append(f"{prefix}_requests_total{labels} {n}")
+
+            family('request_duration_seconds', 'histogram',
+                   'Request latency including retries')
+            for (method, endpoint), histogram in sorted(self._latency.items()):
+                cumulative = 0
+                for bound, n in zip(BUCKET_BOUNDS, histogram.counts):
+                    cumulative += n
+                    labels = _labels(method=method, endpoint=endpoint, le=f"{bound:.6g}")
+                    lines.append(f"{prefix}_request_duration_seconds_bucket{labels} {cumulative}")
+                labels = _labels(method=method, endpoint=endpoint, le='+Inf')
+                lines.append(f"{prefix}_request_duration_seconds_bucket{labels} {histogram.count}")
+                labels = _labels(method=method, endpoint=endpoint)
+                lines.append(f"{prefix}_request_duration_seconds_sum{labels} {histogram.sum:.6f}")
+                lines.append(f"{prefix}_request_duration_seconds_count{labels} {histogram.count}")
+
+            family('retries_total', 'counter', 'Retried attempts')
+            for (method, endpoint), n in sorted(self._retries.items()):
+                labels = _labels(method=method, endpoint=endpoint)
+                lines.append(f"{prefix}_retries_total{labels} {n}")
+
+            family('errors_total', 'counter', 'Failed requests by status class or exception')
+            for (method, endpoint, kind), n in sorted(self._errors.items()):
+                labels = _labels(method=method, endpoint=endpoint, kind=kind)
+                lines.append(f"{prefix}_errors_total{labels} {n}")
+
+            for name, values in (('bytes_sent_total', self._bytes_sent),
+                                 ('bytes_received_total', self._bytes_received)):
+                family(name, 'counter', name[:-6].replace('_', ' ').capitalize())
+                for (method, endpoint), n in sorted(values.items()):
+                    lines.append(f"{prefix}_{name}{_labels(method=method, endpoint=endpoint)} {n}")
+
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """Discard everything recorded so far."""
+        with self._lock:
+            for values in (self._latency, self._requests, self._retries,
+                           self._errors, self._bytes_sent, self._bytes_received):
+                values.clear()
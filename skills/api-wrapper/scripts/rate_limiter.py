@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Token-bucket rate limiter that adapts to server rate-limit headers.
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+# X-RateLimit-Reset values above this are epoch timestamps, not deltas
+EPOCH_THRESHOLD = 10 ** 9
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    """Case-insensitive header lookup that also works on plain dicts."""
+    value = headers.get(name)
+    if value is None:
+        lowered = name.lower()
+        for key, candidate in headers.items():
+            if key.lower() == lowered:
+                return candidate
+    return value
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Thread- and asyncio-safe token bucket.
+
+    Each acquire() reserves a token immediately and then waits until that
+    token is due, so concurrent callers are spaced evenly rather than all
+    waking at once. Feeding response headers to update_from_headers()
+    lets the limiter pause for Retry-After and slow down to the pace the
+    server's X-RateLimit-* headers allow.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None, adaptive: bool = True):
+        """
+        Initialize rate limiter.
+
+        Args:
+            rate: Sustained requests per second
+            burst: Bucket capacity (default: one second's worth of requests)
+            adaptive: Lower the rate to fit the server's remaining quota
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.adaptive = adaptive
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self) -> float:
+        """Block the calling thread until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Wait without blocking the event loop until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def block(self, seconds: float):
+        """Hold all requests for the given number of seconds."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._blocked_until = max(self._blocked_until, until)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        Adapt to rate-limit information in a response.
+
+        Honors Retry-After, and for X-RateLimit-Remaining/-Reset caps the
+        available tokens at the remaining quota. When adaptive, the rate is
+        lowered to spread that quota over the time left in the window.
+        """
+        retry_after = parse_retry_after(_header(headers, 'Retry-After'))
+        if retry_after:
+            self.block(retry_after)
+
+        remaining = _header(headers, 'X-RateLimit-Remaining')
+        if remaining is None:
+            return
+        try:
+            remaining = int(float(remaining))
+        except ValueError:
+            return
+
+        reset_in = None
+        reset = _header(headers, 'X-RateLimit-Reset')
+        if reset is not None:
+            try:
+                reset_in = float(reset)
+                if reset_in > EPOCH_THRESHOLD:
+                    reset_in -= time.time()
+                reset_in = max(0.0, reset_in)
+            except ValueError:
+                reset_in = None
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, remaining)
+            if self.adaptive and reset_in:
+                # Keep a little headroom so we settle just under the limit
+                self.rate = min(self.max_rate, max(remaining * 0.95, 1) / reset_in)
+
+        if remaining <= 0 and reset_in:
+            self.block(reset_in)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+HTTP response cache with LRU eviction and ETag/Last-Modified revalidation.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into a dict of lower-cased directives."""
+    directives = {}
+    for part in (value or '').split(','):
+        name, _, arg = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = arg.strip('"') or None
+    return directives
+
+
+class ResponseCache:
+    """
+    Thread-safe cache of JSON responses for APIClient.
+
+    Entries are evicted least-recently-used once either max_entries or
+    max_bytes is exceeded. Responses marked no-store are never kept; an
+    entry is served without a request while within its max-age, and
+    otherwise revalidated with If-None-Match/If-Modified-Since so an
+    unchanged resource costs a 304 instead of a full body. With
+    cache_dir set, entries are also written to disk and survive restarts;
+    the directory is held to max_entries files as well.
+
+    Bodies are kept as JSON text and decoded on every hit (see decode()),
+    so callers are free to mutate what they get back.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        cache_dir: Optional[str] = None
+    ):
+        """
+        Initialize response cache.
+
+        Args:
+            max_entries: Maximum number of cached responses in memory
+            max_bytes: Maximum total body size held in memory
+            cache_dir: Optional directory for a persistent on-disk copy
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._trim_disk()
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict] = None,
+                 vary: str = '') -> str:
+        """Build a cache key from the request; vary separates credentials."""
+        query = json.dumps(params or {}, sort_keys=True, default=str)
+        raw = f"{method.upper()} {url} {query} {vary}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _trim_disk(self):
+        """Delete the least recently written files beyond max_entries."""
+        files = []
+        for path in self.cache_dir.glob('*.json'):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:
+                pass
+        files.sort()
+        for _, path in files[:max(0, len(files) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        if not self.cache_dir:
+            return None
+        try:
+            entry = json.loads(self._disk_path(key).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if 'body' not in entry:
+            # Written by an older version that stored parsed data
+            return None
+        self._insert(key, entry, persist=False)
+        return entry
+
+    def _insert(self, key: str, entry: Dict[str, Any], persist: bool = True):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old['size']
+        self._entries[key] = entry
+        self._bytes += entry['size']
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._bytes > self.max_bytes):
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted['size']
+            self.evictions += 1
+            if self.cache_dir:
+                self._disk_path(evicted_key).unlink(missing_ok=True)
+        if persist and self.cache_dir:
+            path = self._disk_path(key)
+            tmp_path = path.with_name(path.name + '.tmp')
+            tmp_path.write_text(json.dumps(entry), encoding='utf-8')
+            os.replace(tmp_path, path)
+
+    def lookup(self, key: str):
+        """
+        Look up a request before it is sent.
+
+        Returns:
+            (entry, fresh): a fresh entry can be served as is; a stale one
+            must be revalidated with conditional_headers(entry). Returns
+            (None, False) on a miss.
+        """
+        with self._lock:
+            entry = self._load(key)
+            if entry is not None and time.time() < entry['expires']:
+                self.hits += 1
+                return entry, True
+            if entry is not None and (entry.get('etag') or entry.get('last_modified')):
+                return entry, False
+            return None, False
+
+    @staticmethod
+    def decode(entry: Dict[str, Any]):
+        """Fresh (data, links) objects for an entry, independent of the cache."""
+        return json.loads(entry['body']), json.loads(json.dumps(entry['links']))
+
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        """Headers that ask the server to answer 304 if entry is current."""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, key: str, headers: Mapping[str, str], body: str, size: int,
+              links: Optional[Dict[str, Any]] = None):
+        """
+        Count a miss and cache the 200 response if Cache-Control allows it.
+
+        body is the response's JSON text; links is the parsed Link header,
+        kept so cached pages still paginate.
+        """
+        with self._lock:
+            self.misses += 1
+        directives = parse_cache_control(headers.get('Cache-Control'))
+        if 'no-store' in directives:
+            return
+        max_age = 0
+        if 'max-age' in directives and 'no-cache' not in directives:
+            try:
+                max_age = int(directives['max-age'])
+            except (TypeError, ValueError):
+                max_age = 0
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        # Without freshness or validators the entry could never be used
+        if max_age <= 0 and not etag and not last_modified:
+            return
+        entry = {
+            'body': body,
+            'size': size,
+            'etag': etag,
+            'last_modified': last_modified,
+            'expires': time.time() + max_age,
+            'links': links or {},
+        }
+        with self._lock:
+            if size <= self.max_bytes:
+                self._insert(key, entry)
+
+    def revalidated(self, key: str, entry: Dict[str, Any],
+                    headers: Mapping[str, str]):
+        """Handle a 304 for a looked-up entry: refresh it and return decode(entry)."""
+        directives = parse_cache_control(headers.get('Cache-Control'))
+        if 'max-age' in directives and 'no-cache' not in directives:
+            try:
+                entry['expires'] = time.time() + int(directives['max-age'])
+            except (TypeError, ValueError):
+                pass
+        if headers.get('ETag'):
+            entry['etag'] = headers['ETag']
+        with self._lock:
+            self.revalidations += 1
+            self.hits += 1
+            # Re-insert in case the entry was evicted while the request ran
+            self._insert(key, entry)
+        return self.decode(entry)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current memory usage."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidations': self.revalidations,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def clear(self):
+        """Drop all in-memory and on-disk entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self.cache_dir:
+                for path in self.cache_dir.glob('*.json'):
+                    path.unlink(missing_ok=True)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Response parsing helpers, including incremental decoding of large JSON arrays.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, Optional
+
+WHITESPACE = ' \t\n\r'
+# Characters of consumed text allowed to pile up before the buffer is compacted
+COMPACT_THRESHOLD = 64 * 1024
+
+
+def get_path(data: Any, path: Optional[str], default: Any = None) -> Any:
+    """
+    Look up a dotted path such as "meta.next_cursor" in nested dicts.
+
+    Args:
+        data: Parsed JSON value
+        path: Dot-separated keys; None or "" returns data itself
+        default: Value returned when any key is missing
+
+    Returns:
+        The value at path, or default
+    """
+    if not path:
+        return data
+    for key in path.split('.'):
+        if not isinstance(data, dict) or key not in data:
+            return default
+        data = data[key]
+    return data
+
+
+def extract_items(data: Any, items_key: Optional[str] = None) -> list:
+    """
+    Return the list of records in one page of a list endpoint.
+
+    Args:
+        data: Parsed page body
+        items_key: Dotted path to the records when the page is an object
+            (e.g. "data" or "result.items"); not needed for a bare array
+
+    Returns:
+        List of records (empty if the page has none)
+    """
+    items = get_path(data, items_key)
+    if items is None:
+        return []
+    if not isinstance(items, list):
+        where = f" at '{items_key}'" if items_key else ""
+        raise ValueError(f"Expected a JSON array{where}, got {type(items).__name__}")
+    return items
+
+
+def iter_json_array(
+    chunks: Iterable[bytes],
+    key: Optional[str] = None,
+    encoding: str = 'utf-8'
+) -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array as its bytes arrive.
+
+    Only the element being decoded is held in memory, so an export of any
+    size is processed with a flat footprint. Elements are decoded with
+    json.JSONDecoder.raw_decode, and a value is only accepted once the
+    delimiter after it has arrived, since a partial number decodes too.
+
+    Args:
+        chunks: Byte chunks, e.g. response.iter_content(chunk_size)
+        key: Stream the array stored under this key of an enclosing object
+            (the first occurrence is used) instead of a top-level array
+        encoding: Text encoding of the body
+
+    Yields:
+        Decoded array elements, in order
+
+    Raises:
+        ValueError: If the body is not the expected array or is truncated
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    chunks = iter(chunks)
+    buf = ''
+    pos = 0
+    eof = False
+
+    def fill():
+        # Append the next chunk, dropping everything before pos
+        nonlocal buf, pos, eof
+        for chunk in chunks:
+            text = text_decoder.decode(chunk)
+            if text:
+                buf = buf[pos:] + text
+                pos = 0
+                return
+        buf = buf[pos:] + text_decoder.decode(b'', final=True)
+        pos = 0
+        eof = True
+
+    # Find the opening bracket
+    if key is None:
+        while True:
+            while pos < len(buf) and buf[pos] in WHITESPACE:
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            fill()
+        if pos >= len(buf) or buf[pos] != '[':
+            raise ValueError("Response body is not a JSON array")
+        pos += 1
+    else:
+        pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        tail = len(key) + 64
+        while True:
+            match = pattern.search(buf, pos)
+            if match:
+                pos = match.end()
+                break
+            if eof:
+                raise ValueError(f"No JSON array found under '{key}'")
+            # Keep enough text to match a key split across chunks
+            pos = max(pos, len(buf) - tail)
+            fill()
+
+    while True:
+        while pos < len(buf) and buf[pos] in WHITESPACE:
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                raise ValueError("Truncated JSON array")
+            fill()
+            continue
+
+        char = buf[pos]
+        if char == ']':
+            return
+        if char == ',':
+            pos += 1
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise ValueError("Malformed JSON array element") from None
+            fill()
+            continue
+        # A prefix such as "-1." or "12" can decode on its own, so only
+        # accept a value once the delimiter after it has arrived
+        if end == len(buf) and not eof:
+            fill()
+            continue
+        if end < len(buf) and buf[end] not in WHITESPACE + ',]':
+            if eof:
+                raise ValueError("Malformed JSON array element")
+            fill()
+            continue
+
+        pos = end
+        yield value
+        if pos > COMPACT_THRESHOLD:
+            buf = buf[pos:]
+            pos = 0
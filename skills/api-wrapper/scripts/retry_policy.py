@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Retry scheduling for APIClient: jittered backoff, retry budget and circuit breaker.
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional, Set
+
+import requests
+
+from rate_limiter import parse_retry_after
+
+# Statuses worth retrying: throttling and transient server/gateway errors
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of the requests made.
+
+    Every request deposits `ratio` tokens and every retry spends one, so
+    during an outage retries add at most `ratio` extra load instead of
+    multiplying it by the attempt count. `reserve` tokens are available
+    up front so occasional failures on a quiet client are still retried.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: int = 10):
+        """
+        Initialize retry budget.
+
+        Args:
+            ratio: Retries allowed per request, on average
+            reserve: Retries available before any requests are made; also
+                the most that can be saved up
+        """
+        self.ratio = ratio
+        self.capacity = float(reserve)
+        self._tokens = float(reserve)
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        """Credit the budget for one (first-attempt) request."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; False if it is exhausted."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class CircuitBreaker:
+    """
+    Fails fast while a host is down.
+
+    After `failure_threshold` consecutive failures (connection errors,
+    timeouts, 5xx) the circuit opens and requests are rejected without
+    being sent. Once `reset_timeout` has passed, a single trial request is
+    let through: success closes the circuit, failure opens it again. Every
+    request admitted by allow() must end in record_success(),
+    record_failure() or release().
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before a trial request
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half-open'."""
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return 'open'
+            return 'half-open'
+
+    def retry_in(self) -> float:
+        """Seconds until the circuit lets a trial request through."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        """The host answered; close the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """The host failed; open the circuit once the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def release(self):
+        """
+        A request ended without saying anything about the host (e.g. an
+        invalid URL or an interrupt); free the half-open trial slot so the
+        next request can probe instead.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is retried.
+
+    Delays use decorrelated jitter (each sleep is drawn between base_delay
+    and three times the previous one, capped at max_delay), so clients that
+    failed together do not retry together. A Retry-After header sets the
+    minimum delay; one longer than max_retry_after is not waited out.
+    Retries also draw on a RetryBudget, and each host gets a
+    CircuitBreaker. Give each client its own policy for a per-client
+    budget, or share one to pool budget and breaker state.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 20.0,
+        max_retry_after: float = 60.0,
+        retry_statuses: Set[int] = RETRY_STATUSES,
+        retry_methods: Optional[Set[str]] = None,
+        budget: Optional[RetryBudget] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0
+    ):
+        """
+        Initialize retry policy.
+
+        Args:
+            max_attempts: Total attempts per request, including the first
+            base_delay: Minimum backoff in seconds
+            max_delay: Maximum backoff in seconds
+            max_retry_after: Longest Retry-After that is waited out
+            retry_statuses: HTTP statuses that are retried
+            retry_methods: Methods that may be retried (default: all);
+                429 responses are retried for any method since the server
+                did not process the request
+            budget: RetryBudget shared by all requests using this policy
+            failure_threshold: Consecutive failures that open a host's circuit
+            reset_timeout: Seconds a circuit stays open before a trial
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_methods = ({m.upper() for m in retry_methods}
+                              if retry_methods is not None else None)
+        self.budget = budget or RetryBudget()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        """Return the circuit breaker for a host, creating it on first use."""
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._breakers[host] = breaker
+            return breaker
+
+    def backoff(self, previous: float) -> float:
+        """Next decorrelated-jitter delay after sleeping `previous` seconds."""
+        upper = max(self.base_delay, previous) * 3
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+    def retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        previous: float,
+        response: Optional[requests.Response] = None
+    ) -> Optional[float]:
+        """
+        Decide whether to retry a failed attempt.
+
+        Args:
+            method: HTTP method of the request
+            attempt: Zero-based number of the attempt that failed
+            previous: Delay slept before that attempt (0 for the first)
+            response: The failed response, or None for a connection
+                error or timeout
+
+        Returns:
+            Seconds to wait before the next attempt, or None to give up
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+
+        retry_after = None
+        if response is not None:
+            if response.status_code not in self.retry_statuses:
+                return None
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None and retry_after > self.max_retry_after:
+                return None
+        throttled = response is not None and response.status_code == 429
+        if (self.retry_methods is not None and not throttled
+                and method.upper() not in self.retry_methods):
+            return None
+
+        if not self.budget.try_spend():
+            return None
+        delay = self.backoff(previous)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
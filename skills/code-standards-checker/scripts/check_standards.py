@@ -3,94 +3,498 @@
 Multi-language code standards checker.
 """
 
+import argparse
+import hashlib
+import json
+import os
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
 
+CACHE_NAME = '.standards-cache.json'
+# Bump when the cache layout or result parsing changes
+CACHE_VERSION = 2
+# Directories that never hold project sources worth linting
+SKIP_DIRS = {'.git', '.hg', '.svn', 'node_modules', '.venv', 'venv', '.tox',
+             '__pycache__', '.mypy_cache', '.pytest_cache', 'build', 'dist'}
+PYTHON_SUFFIXES = ('.py',)
+JAVASCRIPT_SUFFIXES = ('.js', '.jsx', '.mjs', '.cjs')
+TYPESCRIPT_SUFFIXES = ('.ts', '.tsx')
 
-def run_command(cmd: List[str]) -> Dict[str, any]:
+# Config files whose contents change a tool's verdict
+FLAKE8_CONFIGS = ('setup.cfg', 'tox.ini', '.flake8')
+ESLINT_CONFIGS = ('package.json', '.eslintrc', '.eslintrc.js', '.eslintrc.cjs',
+                  '.eslintrc.json', '.eslintrc.yml', '.eslintrc.yaml',
+                  'eslint.config.js', 'eslint.config.mjs', 'eslint.config.cjs')
+TSC_CONFIGS = ('tsconfig.json', 'package.json')
+# Stay well under ARG_MAX (and Windows' 32K command line) when passing paths
+ARGV_LIMIT = 30000 if os.name == 'nt' else 100000
+
+
+def run_command(cmd: List[str], timeout: float = 60) -> Dict[str, any]:
     """Run a command and return results."""
     try:
         result = subprocess.run(
             cmd,
             capture_output=True,
             text=True,
-            timeout=60
+            timeout=timeout
         )
         return {
             'success': result.returncode == 0,
+            'returncode': result.returncode,
             'output': result.stdout,
             'errors': result.stderr
         }
     except Exception as e:
-        return {'success': False, 'errors': str(e)}
+        return {'success': False, 'returncode': None, 'output': '', 'errors': str(e)}
 
 
-def check_python():
-    """Check Python files with flake8."""
-    if not list(Path('.').rglob('*.py')):
-        return None
+def run_batched(cmd: List[str], paths: List[str], timeout: float = 60) -> Dict[str, any]:
+    """
+    Run cmd with paths appended, split into as many runs as argv limits need.
 
-    print("🐍 Checking Python files...")
-    result = run_command(['flake8', '.', '--count', '--statistics'])
+    Outputs are concatenated and the highest exit status is reported, so
+    the result reads like a single invocation.
+    """
+    base = sum(len(arg) + 1 for arg in cmd)
+    batches = [[]]
+    size = base
+    for path in paths:
+        if batches[-1] and size + len(path) + 1 > ARGV_LIMIT:
+            batches.append([])
+            size = base
+        batches[-1].append(path)
+        size += len(path) + 1
 
-    if result['success']:
-        print("  ✅ All Python files passed")
+    combined = {'success': True, 'returncode': 0, 'output': '', 'errors': ''}
+    for batch in batches:
+        result = run_command(cmd + batch, timeout)
+        combined['output'] += result['output']
+        combined['errors'] += result['errors']
+        if result['returncode'] is None:
+            combined.update(success=False, returncode=None)
+            break
+        if result['returncode'] > combined['returncode']:
+            combined.update(success=False, returncode=result['returncode'])
+    return combined
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's contents."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def find_sources(root: str = '.') -> Dict[str, List[str]]:
+    """
+    Collect source files by suffix in one walk, skipping vendored dirs.
+
+    Returns:
+        Dict mapping each suffix to a sorted list of relative paths
+    """
+    sources = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for name in filenames:
+            suffix = os.path.splitext(name)[1]
+            if suffix:
+                path = os.path.normpath(os.path.join(dirpath, name))
+                sources.setdefault(suffix, []).append(path)
+    for paths in sources.values():
+        paths.sort()
+    return sources
+
+
+def has_sources(root: str, suffixes: tuple) -> bool:
+    """Return True as soon as one file with a matching suffix is found."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        if any(name.endswith(suffixes) for name in filenames):
+            return True
+    return False
+
+
+def git_changed_files(staged: bool = False, base: str = 'HEAD') -> List[str]:
+    """
+    List files changed in git, relative to the current directory.
+
+    Args:
+        staged: Only files staged in the index
+        base: Commit to diff the working tree against (ignored if staged);
+            untracked files are included as well
+
+    Returns:
+        Sorted paths of added, copied, modified or renamed files that exist
+    """
+    if staged:
+        commands = [['git', 'diff', '--cached', '--name-only', '--relative',
+                     '--diff-filter=ACMR', '-z']]
     else:
-        print("  ⚠️  Issues found:")
-        print(result['output'] or result['errors'])
+        commands = [['git', 'diff', '--name-only', '--relative',
+                     '--diff-filter=ACMR', '-z', base],
+                    ['git', 'ls-files', '--others', '--exclude-standard', '-z']]
+
+    paths = set()
+    for cmd in commands:
+        result = run_command(cmd)
+        if not result['success']:
+            raise RuntimeError(result['errors'].strip() or f"{' '.join(cmd)} failed")
+        paths.update(p for p in result['output'].split('\0') if p)
+    return sorted(
+        os.path.normpath(p) for p in paths
+        if os.path.isfile(p) and not SKIP_DIRS.intersection(Path(p).parts)
+    )
+
+
+def group_by_suffix(paths: List[str]) -> Dict[str, List[str]]:
+    """Group paths by file suffix, as find_sources() does."""
+    sources = {}
+    for path in paths:
+        suffix = os.path.splitext(path)[1]
+        if suffix:
+            sources.setdefault(suffix, []).append(path)
+    return sources
+
+
+def tool_context(version_cmd: List[str], configs: tuple, timeout: float) -> Optional[str]:
+    """
+    Fingerprint a tool's version and configuration.
+
+    Returns:
+        Hex digest, or None if the tool's version cannot be determined
+    """
+    result = run_command(version_cmd, timeout)
+    if not result['success']:
+        return None
+    hasher = hashlib.sha256(result['output'].strip().encode('utf-8'))
+    for config in configs:
+        if os.path.isfile(config):
+            hasher.update(f"\0{config}\0{file_digest(config)}".encode('utf-8'))
+    return hasher.hexdigest()
+
 
-    return result
+class ResultCache:
+    """
+    Lint results of unchanged files, keyed by content hash.
 
+    Each tool has its own section; entries are only reused when the file's
+    SHA-256 and the tool context (version plus config files) both match.
+    """
+
+    def __init__(self, cache_path: str):
+        """Load the cache, ignoring it if missing or from another version."""
+        self.cache_path = Path(cache_path)
+        self.tools = {}
+        try:
+            data = json.loads(self.cache_path.read_text(encoding='utf-8'))
+            if data.get('version') == CACHE_VERSION:
+                self.tools = data.get('tools', {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, tool: str, path: str, digest: str, context: str) -> Optional[List[str]]:
+        """Return the cached output lines for a file, or None."""
+        entry = self.tools.get(tool, {}).get(path)
+        if entry and entry['sha256'] == digest and entry['context'] == context:
+            return entry['output']
+        return None
+
+    def put(self, tool: str, path: str, digest: str, context: str, output: List[str]):
+        """Remember a file's output lines."""
+        self.tools.setdefault(tool, {})[path] = {
+            'sha256': digest,
+            'context': context,
+            'output': output,
+        }
+
+    def prune(self, tool: str, paths: List[str]):
+        """Drop entries for files that no longer exist in this run's file set."""
+        keep = set(paths)
+        section = self.tools.get(tool, {})
+        for path in [p for p in section if p not in keep]:
+            del section[path]
+
+    def save(self):
+        """Atomically write the cache to disk."""
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        tmp_path.write_text(
+            json.dumps({'version': CACHE_VERSION, 'tools': self.tools}, sort_keys=True),
+            encoding='utf-8'
+        )
+        os.replace(tmp_path, self.cache_path)
 
-def check_javascript():
+
+def split_by_file(output: str) -> Dict[str, List[str]]:
+    """Group "path:line:col: message" lines by their normalized path."""
+    per_file = {}
+    for line in output.splitlines():
+        path, sep, _ = line.partition(':')
+        if sep and path:
+            key = os.path.relpath(os.path.abspath(path))
+            per_file.setdefault(key, []).append(line)
+    return per_file
+
+
+def split_eslint_json(output: str) -> Dict[str, List[str]]:
+    """
+    Group ESLint --format json results by their normalized path.
+
+    Each message becomes a "path:line:col: message [Error/rule]" line;
+    severity 2 is an error, anything else a warning. Batched runs print
+    one JSON array each, so every array in the output is read.
+
+    Raises:
+        ValueError: If the output is not ESLint JSON
+    """
+    decoder = json.JSONDecoder()
+    per_file = {}
+    pos = 0
+    output = output.strip()
+    while pos < len(output):
+        files, pos = decoder.raw_decode(output, pos)
+        while pos < len(output) and output[pos].isspace():
+            pos += 1
+        for entry in files:
+            key = os.path.relpath(entry['filePath'])
+            lines = per_file.setdefault(key, [])
+            for msg in entry['messages']:
+                severity = 'Error' if msg.get('severity') == 2 else 'Warning'
+                rule = f"/{msg['ruleId']}" if msg.get('ruleId') else ''
+                lines.append(f"{key}:{msg.get('line', 0)}:{msg.get('column', 0)}: "
+                             f"{msg['message']} [{severity}{rule}]")
+    return per_file
+
+
+def lint_files(
+    tool: str,
+    cmd: List[str],
+    files: List[str],
+    context: Optional[str],
+    cache: Optional[ResultCache],
+    is_error: Callable[[str], bool],
+    timeout: float,
+    prune: bool = True,
+    split: Callable[[str], Dict[str, List[str]]] = split_by_file
+) -> Dict[str, any]:
+    """
+    Lint files one tool invocation at a time, reusing cached results.
+
+    Only files missing from the cache are passed to the tool. Results
+    are cached per file unless the tool itself failed (exit status above
+    1, e.g. a crash or a missing executable).
+
+    Args:
+        tool: Cache section name
+        cmd: Tool command; file paths are appended
+        files: Files to check
+        context: Tool fingerprint from tool_context(); None disables caching
+        cache: Optional ResultCache
+        is_error: Whether an output line is an error (not just a warning)
+        timeout: Seconds before the tool is killed
+        prune: Drop cache entries for files not in files (only correct
+            when files is the complete set)
+        split: Groups the tool's output into lines per normalized path;
+            raises ValueError if the output cannot be read
+
+    Returns:
+        Result dict with success, output, errors, checked and cached counts
+    """
+    use_cache = cache is not None and context is not None
+    outputs = {}
+    pending = []
+    for path in files:
+        digest = file_digest(path)
+        cached = cache.get(tool, path, digest, context) if use_cache else None
+        if cached is None:
+            pending.append((path, digest))
+        else:
+            outputs[path] = cached
+
+    errors = ''
+    if pending:
+        result = run_batched(cmd, [path for path, _ in pending], timeout)
+        per_file = None
+        if result['returncode'] in (0, 1):
+            try:
+                per_file = split(result['output'])
+            except (ValueError, KeyError, TypeError):
+                pass
+        if per_file is None:
+            return {'success': False, 'output': result['output'],
+                    'errors': result['errors'], 'checked': len(pending),
+                    'cached': len(files) - len(pending)}
+        errors = result['errors']
+        for path, digest in pending:
+            outputs[path] = per_file.get(path, [])
+            if use_cache:
+                cache.put(tool, path, digest, context, outputs[path])
+
+    if use_cache and prune:
+        cache.prune(tool, files)
+    lines = [line for path in files for line in outputs[path]]
+    return {
+        'success': not any(is_error(line) for line in lines),
+        'output': '\n'.join(lines),
+        'errors': errors,
+        'checked': len(pending),
+        'cached': len(files) - len(pending),
+    }
+
+
+def check_python(sources=None, cache=None, timeout=60, partial=False):
+    """Check Python files with flake8."""
+    if sources is None:
+        if not has_sources('.', PYTHON_SUFFIXES):
+            return None
+        return run_command(['flake8', '.', '--count', '--statistics'], timeout)
+
+    files = [p for suffix in PYTHON_SUFFIXES for p in sources.get(suffix, [])]
+    if not files:
+        return None
+    context = tool_context(['flake8', '--version'], FLAKE8_CONFIGS, timeout)
+    return lint_files('flake8', ['flake8'], files, context, cache,
+                      lambda line: True, timeout, prune=not partial)
+
+
+def check_javascript(sources=None, cache=None, timeout=60, partial=False):
     """Check JavaScript files with ESLint."""
     if not Path('package.json').exists():
         return None
 
-    print("📦 Checking JavaScript files...")
-    result = run_command(['npx', 'eslint', '.'])
+    if sources is None:
+        return run_command(['npx', 'eslint', '.'], timeout)
 
-    if result['success']:
-        print("  ✅ All JavaScript files passed")
-    else:
-        print("  ⚠️  Issues found:")
-        print(result['output'] or result['errors'])
+    files = [p for suffix in JAVASCRIPT_SUFFIXES for p in sources.get(suffix, [])]
+    if not files:
+        return None
+    context = tool_context(['npx', 'eslint', '--version'], ESLINT_CONFIGS, timeout)
+    # The json format is the same across ESLint versions (9 dropped unix)
+    return lint_files('eslint', ['npx', 'eslint', '--format', 'json'], files,
+                      context, cache, lambda line: line.rsplit(' [', 1)[-1].startswith('Error'),
+                      timeout, prune=not partial, split=split_eslint_json)
 
-    return result
 
+def check_typescript(sources=None, cache=None, timeout=60, partial=False):
+    """
+    Check TypeScript files.
 
-def check_typescript():
-    """Check TypeScript files."""
+    tsc type-checks the whole project at once, so the cache holds a single
+    result keyed on every TypeScript file plus tsconfig and tsc version.
+    With partial sources (changed files only) the project is checked,
+    uncached, only if a TypeScript file or tsconfig.json changed.
+    """
     if not Path('tsconfig.json').exists():
         return None
 
-    print("📘 Checking TypeScript files...")
-    result = run_command(['npx', 'tsc', '--noEmit'])
+    if sources is None:
+        return run_command(['npx', 'tsc', '--noEmit'], timeout)
+    if partial:
+        changed = any(sources.get(suffix) for suffix in TYPESCRIPT_SUFFIXES)
+        if not changed and 'tsconfig.json' not in sources.get('.json', []):
+            return None
+        return {**run_command(['npx', 'tsc', '--noEmit'], timeout),
+                'checked': 1, 'cached': 0}
+
+    context = tool_context(['npx', 'tsc', '--version'], TSC_CONFIGS, timeout)
+    project_key = None
+    if cache is not None and context is not None:
+        hasher = hashlib.sha256(context.encode('utf-8'))
+        for suffix in TYPESCRIPT_SUFFIXES:
+            for path in sources.get(suffix, []):
+                hasher.update(f"\0{path}\0{file_digest(path)}".encode('utf-8'))
+        project_key = hasher.hexdigest()
+        entry = cache.tools.get('tsc', {}).get('project')
+        if entry and entry['key'] == project_key:
+            return {**entry['result'], 'checked': 0, 'cached': 1}
 
+    result = run_command(['npx', 'tsc', '--noEmit'], timeout)
+    # Only cache genuine verdicts, not npx or tsc failing to start
+    if project_key and (result['success'] or 'error TS' in result['output']):
+        cache.tools['tsc'] = {'project': {'key': project_key, 'result': result}}
+    return {**result, 'checked': 1, 'cached': 0}
+
+
+CHECKS = [
+    ('🐍', 'Python', check_python),
+    ('📦', 'JavaScript', check_javascript),
+    ('📘', 'TypeScript', check_typescript),
+]
+
+
+def report(icon: str, label: str, result: Dict[str, any], seconds: float):
+    """Print one checker's result block."""
+    counts = ''
+    if 'checked' in result:
+        counts = f", {result['checked']} checked, {result['cached']} cached"
+    print(f"{icon} {label} files ({seconds:.2f}s{counts})")
     if result['success']:
-        print("  ✅ All TypeScript files passed")
+        print(f"  ✅ All {label} files passed")
     else:
         print("  ⚠️  Issues found:")
-        print(result['errors'])
-
-    return result
+        print(result['output'] or result['errors'])
 
 
 def main():
     """Run all applicable standards checks."""
+    parser = argparse.ArgumentParser(description="Multi-language code standards checker")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Lint everything and ignore {CACHE_NAME}")
+    parser.add_argument("--timeout", type=float, default=60,
+                        help="Seconds before a tool is stopped (default: 60)")
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument("--changed", nargs="?", const="HEAD", metavar="BASE",
+                       help="Only check files changed since BASE (default: HEAD), "
+                            "including untracked files")
+    scope.add_argument("--staged", action="store_true",
+                       help="Only check files staged for commit")
+    args = parser.parse_args()
+
     print("🔍 Running code standards checks...\n")
 
+    cache = sources = None
+    partial = bool(args.changed or args.staged)
+    if not args.no_cache:
+        cache = ResultCache(CACHE_NAME)
+    if partial:
+        try:
+            changed = git_changed_files(staged=args.staged, base=args.changed or 'HEAD')
+        except RuntimeError as e:
+            print(f"❌ Could not list changed files: {e}")
+            return 1
+        if not changed:
+            print("✅ No changed files to check")
+            return 0
+        print(f"Checking {len(changed)} changed file(s)\n")
+        sources = group_by_suffix(changed)
+    elif cache is not None:
+        sources = find_sources('.')
+
+    # The tools are separate processes, so threads are enough to run them
+    # side by side; each result is printed as soon as it finishes
     results = []
-    results.append(check_python())
-    results.append(check_javascript())
-    results.append(check_typescript())
+    with ThreadPoolExecutor(max_workers=len(CHECKS)) as pool:
+        start = time.perf_counter()
+        futures = {pool.submit(check, sources, cache, args.timeout, partial): (icon, label)
+                   for icon, label, check in CHECKS}
+        for future in as_completed(futures):
+            result = future.result()
+            if result is None:
+                continue
+            icon, label = futures[future]
+            report(icon, label, result, time.perf_counter() - start)
+            results.append(result)
 
-    # Filter out None results
-    results = [r for r in results if r is not None]
+    if cache is not None:
+        cache.save()
 
     if not results:
+        if partial:
+            print("✅ No changed files need checking")
+            return 0
         print("❌ No recognized project type found")
         return 1
 
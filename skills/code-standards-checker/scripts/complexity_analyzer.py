@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Code complexity metrics: cyclomatic complexity, function length and nesting.
+"""
+
+import argparse
+import ast
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from rule_engine import CACHE_NAME, ResultCache, Rule, check_files, python_files, register
+
+DEFAULTS = {
+    'max_complexity': 10,
+    'max_function_lines': 50,
+    'max_nesting': 4,
+    'max_arguments': 6,
+}
+
+
+class FunctionRule(Rule):
+    """Rule helper that tracks the enclosing function in a stack of frames."""
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.frames = []
+
+    def enter_FunctionDef(self, node, ctx):
+        self.frames.append(self.new_frame(node, ctx))
+
+    def leave_FunctionDef(self, node, ctx):
+        self.close_frame(self.frames.pop(), node, ctx)
+
+    enter_AsyncFunctionDef = enter_FunctionDef
+    leave_AsyncFunctionDef = leave_FunctionDef
+
+    def new_frame(self, node, ctx):
+        return {}
+
+    def close_frame(self, frame, node, ctx):
+        pass
+
+
+@register
+class CyclomaticComplexity(FunctionRule):
+    """
+    McCabe complexity: one plus the number of decision points.
+
+    Branches, loops, except clauses, match cases, boolean operators and
+    comprehension clauses each add one. Nested functions are measured
+    separately and do not add to their parent.
+    """
+
+    code = 'C901'
+    description = 'Function is too complex'
+
+    def new_frame(self, node, ctx):
+        return {'complexity': 1}
+
+    def close_frame(self, frame, node, ctx):
+        complexity = frame['complexity']
+        ctx.function_metrics(node)['complexity'] = complexity
+        limit = self.option('max_complexity', DEFAULTS['max_complexity'])
+        if complexity > limit:
+            ctx.report(node, self.code,
+                       f"'{ctx.qualname(node)}' is too complex ({complexity} > {limit})")
+
+    def _add(self, count=1):
+        if self.frames:
+            self.frames[-1]['complexity'] += count
+
+    def enter_If(self, node, ctx):
+        self._add()
+
+    enter_For = enter_AsyncFor = enter_While = enter_IfExp = enter_If
+    enter_ExceptHandler = enter_match_case = enter_If
+
+    def enter_BoolOp(self, node, ctx):
+        self._add(len(node.values) - 1)
+
+    def enter_comprehension(self, node, ctx):
+        self._add(1 + len(node.ifs))
+
+
+@register
+class FunctionLength(Rule):
+    """Functions longer than max_function_lines lines, decorators excluded."""
+
+    code = 'C902'
+    description = 'Function is too long'
+
+    def enter_FunctionDef(self, node, ctx):
+        length = node.end_lineno - node.lineno + 1
+        ctx.function_metrics(node)['length'] = length
+        limit = self.option('max_function_lines', DEFAULTS['max_function_lines'])
+        if length > limit:
+            ctx.report(node, self.code,
+                       f"'{ctx.qualname(node)}' is too long ({length} > {limit} lines)")
+
+    enter_AsyncFunctionDef = enter_FunctionDef
+
+
+@register
+class NestingDepth(FunctionRule):
+    """Blocks nested more than max_nesting levels deep inside a function."""
+
+    code = 'C903'
+    description = 'Blocks are nested too deeply'
+
+    def new_frame(self, node, ctx):
+        return {'depth': 0, 'max': 0, 'levels': []}
+
+    def close_frame(self, frame, node, ctx):
+        ctx.function_metrics(node)['nesting'] = frame['max']
+        limit = self.option('max_nesting', DEFAULTS['max_nesting'])
+        if frame['max'] > limit:
+            ctx.report(node, self.code,
+                       f"'{ctx.qualname(node)}' nests blocks too deeply "
+                       f"({frame['max']} > {limit})")
+
+    def enter_block(self, node, ctx):
+        if not self.frames:
+            return
+        frame = self.frames[-1]
+        parent = ctx.parents[-1] if ctx.parents else None
+        # An elif is an If in its parent's orelse, but reads as the same level
+        is_elif = (isinstance(node, ast.If) and isinstance(parent, ast.If)
+                   and parent.orelse == [node])
+        frame['levels'].append(not is_elif)
+        if not is_elif:
+            frame['depth'] += 1
+            frame['max'] = max(frame['max'], frame['depth'])
+
+    def leave_block(self, node, ctx):
+        if self.frames:
+            frame = self.frames[-1]
+            if frame['levels'].pop():
+                frame['depth'] -= 1
+
+    # Statements that add a level of nesting
+    enter_If = enter_For = enter_AsyncFor = enter_While = enter_block
+    enter_With = enter_AsyncWith = enter_Try = enter_TryStar = enter_Match = enter_block
+    leave_If = leave_For = leave_AsyncFor = leave_While = leave_block
+    leave_With = leave_AsyncWith = leave_Try = leave_TryStar = leave_Match = leave_block
+
+
+@register
+class TooManyArguments(Rule):
+    """Functions taking more than max_arguments parameters (self/cls excluded)."""
+
+    code = 'C904'
+    description = 'Function takes too many arguments'
+
+    def enter_FunctionDef(self, node, ctx):
+        args = node.args
+        names = [a.arg for a in args.posonlyargs + args.args + args.kwonlyargs]
+        if names and names[0] in ('self', 'cls'):
+            names = names[1:]
+        count = len(names) + bool(args.vararg) + bool(args.kwarg)
+        ctx.function_metrics(node)['arguments'] = count
+        limit = self.option('max_arguments', DEFAULTS['max_arguments'])
+        if count > limit:
+            ctx.report(node, self.code,
+                       f"'{ctx.qualname(node)}' takes too many arguments ({count} > {limit})")
+
+    enter_AsyncFunctionDef = enter_FunctionDef
+
+
+COMPLEXITY_RULES = [CyclomaticComplexity.code, FunctionLength.code,
+                    NestingDepth.code, TooManyArguments.code]
+
+
+def add_engine_arguments(parser):
+    """Options shared by the rule engine front ends."""
+    parser.add_argument("paths", nargs="*", default=["."],
+                        help="Files or directories to check (default: .)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Re-check every file and ignore {CACHE_NAME}")
+    parser.add_argument("--json", action="store_true",
+                        help="Print a JSON report")
+    for name, default in DEFAULTS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default,
+                            help=f"Threshold (default: {default})")
+
+
+def engine_config(args):
+    """Rule config from parsed arguments."""
+    return {name: getattr(args, name) for name in DEFAULTS}
+
+
+def main():
+    """Report complexity metrics and threshold violations."""
+    parser = argparse.ArgumentParser(description="Code complexity metrics")
+    add_engine_arguments(parser)
+    parser.add_argument("--top", type=int, default=20,
+                        help="Number of most complex functions to list (default: 20)")
+    args = parser.parse_args()
+
+    files = python_files(args.paths)
+    cache = None if args.no_cache else ResultCache(CACHE_NAME)
+    results = check_files(files, COMPLEXITY_RULES, engine_config(args),
+                          modules=['complexity_analyzer'], jobs=args.jobs,
+                          cache=cache, section='complexity')
+    if cache is not None:
+        cache.save()
+
+    functions = [dict(f, path=r['path']) for r in results for f in r['functions']]
+    functions.sort(key=lambda f: (-f.get('complexity', 0), f['path'], f['line']))
+    violations = [v for r in results for v in r['violations']]
+
+    if args.json:
+        print(json.dumps({'files': len(files), 'functions': functions,
+                          'violations': violations}, indent=2))
+        return 1 if violations else 0
+
+    print(f"📊 Complexity of {len(functions)} functions in {len(files)} files\n")
+    print(f"{'CC':>4} {'Lines':>6} {'Nest':>5}  Function")
+    print("-" * 60)
+    for f in functions[:args.top]:
+        print(f"{f.get('complexity', 0):>4} {f.get('length', 0):>6} {f.get('nesting', 0):>5}  "
+              f"{f['path']}:{f['line']} {f['name']}")
+    if functions:
+        average = sum(f.get('complexity', 0) for f in functions) / len(functions)
+        print(f"\nAverage complexity: {average:.2f}")
+
+    if violations:
+        print(f"\n⚠️  {len(violations)} issue(s):")
+        for v in violations:
+            print(f"{v['path']}:{v['line']}:{v['col']}: {v['code']} {v['message']}")
+        return 1
+    print("\n✅ All functions within thresholds")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Custom team rules checker.
+
+Runs the team rules below together with the complexity rules from
+complexity_analyzer.py in a single parse and traversal per file.
+Additional rules can be loaded from any module that registers them
+with rule_engine.register (see --rules-module).
+"""
+
+import argparse
+import ast
+import importlib
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from complexity_analyzer import COMPLEXITY_RULES, add_engine_arguments, engine_config
+from rule_engine import CACHE_NAME, RULES, ResultCache, Rule, check_files, python_files, register
+
+# Calls whose result is a fresh mutable object
+MUTABLE_CALLS = {'list', 'dict', 'set', 'defaultdict', 'OrderedDict', 'deque'}
+
+
+@register
+class BareExcept(Rule):
+    """A bare `except:` also catches KeyboardInterrupt and SystemExit."""
+
+    code = 'T001'
+    description = 'Bare except clause'
+
+    def enter_ExceptHandler(self, node, ctx):
+        if node.type is None:
+            ctx.report(node, self.code, "Bare 'except:'; catch Exception or something narrower")
+
+
+@register
+class MutableDefault(Rule):
+    """Default argument values are shared between calls."""
+
+    code = 'T002'
+    description = 'Mutable default argument'
+
+    def enter_arguments(self, node, ctx):
+        for default in node.defaults + [d for d in node.kw_defaults if d is not None]:
+            mutable = isinstance(default, (ast.List, ast.Dict, ast.Set,
+                                           ast.ListComp, ast.DictComp, ast.SetComp))
+            if (isinstance(default, ast.Call) and isinstance(default.func, ast.Name)
+                    and default.func.id in MUTABLE_CALLS):
+                mutable = True
+            if mutable:
+                ctx.report(default, self.code, "Mutable default argument; use None instead")
+
+
+@register
+class MissingDocstring(Rule):
+    """Public functions and classes document themselves."""
+
+    code = 'T003'
+    description = 'Public function or class without a docstring'
+
+    def enter_FunctionDef(self, node, ctx):
+        if node.name.startswith('_'):
+            return
+        # Nested helpers are implementation details
+        if any(isinstance(p, (ast.FunctionDef, ast.AsyncFunctionDef)) for p in ctx.parents):
+            return
+        if ast.get_docstring(node) is None:
+            kind = 'class' if isinstance(node, ast.ClassDef) else 'function'
+            ctx.report(node, self.code, f"Public {kind} '{ctx.qualname(node)}' has no docstring")
+
+    enter_AsyncFunctionDef = enter_ClassDef = enter_FunctionDef
+
+
+@register
+class WildcardImport(Rule):
+    """`from x import *` hides where names come from."""
+
+    code = 'T004'
+    description = 'Wildcard import'
+
+    def enter_ImportFrom(self, node, ctx):
+        if any(alias.name == '*' for alias in node.names):
+            ctx.report(node, self.code, f"Wildcard import from '{node.module}'")
+
+
+@register
+class ComparisonToSingleton(Rule):
+    """Compare to None, True and False with `is`, not `==`."""
+
+    code = 'T005'
+    description = 'Equality comparison with None/True/False'
+
+    def enter_Compare(self, node, ctx):
+        for op, right in zip(node.ops, node.comparators):
+            if (isinstance(op, (ast.Eq, ast.NotEq)) and isinstance(right, ast.Constant)
+                    and any(right.value is singleton for singleton in (None, True, False))):
+                ctx.report(node, self.code, f"Comparison to {right.value!r}; use 'is'")
+
+
+TEAM_RULES = [BareExcept.code, MutableDefault.code, MissingDocstring.code,
+              WildcardImport.code, ComparisonToSingleton.code]
+
+
+def main():
+    """Check files against the team rules and complexity thresholds."""
+    parser = argparse.ArgumentParser(description="Custom team rules checker")
+    add_engine_arguments(parser)
+    parser.add_argument("--rules-module", action="append", default=[],
+                        metavar="MODULE",
+                        help="Import extra rules from MODULE (repeatable); all of "
+                             "its registered rules are enabled")
+    parser.add_argument("--select", help="Comma-separated rule codes to run")
+    parser.add_argument("--ignore", default="", help="Comma-separated rule codes to skip")
+    parser.add_argument("--list-rules", action="store_true",
+                        help="List available rules and exit")
+    args = parser.parse_args()
+
+    modules = ['complexity_analyzer', 'custom_checker']
+    codes = COMPLEXITY_RULES + TEAM_RULES
+    for module in args.rules_module:
+        known = set(RULES)
+        importlib.import_module(module)
+        codes += sorted(set(RULES) - known)
+        modules.append(module)
+
+    if args.list_rules:
+        for code in codes:
+            print(f"{code}  {RULES[code].description}")
+        return 0
+
+    if args.select:
+        codes = [c for c in codes if c in args.select.split(',')]
+    ignored = set(filter(None, args.ignore.split(',')))
+    codes = [c for c in codes if c not in ignored]
+
+    files = python_files(args.paths)
+    cache = None if args.no_cache else ResultCache(CACHE_NAME)
+    results = check_files(files, codes, engine_config(args), modules=modules,
+                          jobs=args.jobs, cache=cache, section='custom')
+    if cache is not None:
+        cache.save()
+    violations = [v for r in results for v in r['violations']]
+
+    if args.json:
+        print(json.dumps({'files': len(files), 'rules': codes,
+                          'violations': violations}, indent=2))
+        return 1 if violations else 0
+
+    for v in violations:
+        print(f"{v['path']}:{v['line']}:{v['col']}: {v['code']} {v['message']}")
+    if violations:
+        print(f"\n⚠️  {len(violations)} issue(s) in {len(files)} files")
+        return 1
+    print(f"✅ {len(files)} files passed {len(codes)} rules")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
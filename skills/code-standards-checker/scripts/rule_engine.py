@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Single-pass AST rule engine shared by complexity_analyzer.py and custom_checker.py.
+
+Each file is parsed once and walked once; every rule receives callbacks
+for just the node types it handles. Files are checked in parallel on a
+process pool and results are cached by content hash.
+"""
+
+import ast
+import hashlib
+import importlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from check_standards import SKIP_DIRS, ResultCache, file_digest
+
+# Bump when the engine or result format changes so cached results are dropped
+ENGINE_VERSION = 1
+CACHE_NAME = '.rules-cache.json'
+# Below this many files a process pool costs more than it saves
+MIN_PARALLEL_FILES = 16
+
+# Rule classes by code, filled in by @register
+RULES = {}
+
+
+def register(rule_class):
+    """
+    Class decorator that makes a rule available by its code.
+
+    A later registration under the same code wins, so a script that is
+    both run as __main__ and imported by name registers cleanly.
+    """
+    RULES[rule_class.code] = rule_class
+    return rule_class
+
+
+class Rule:
+    """
+    Base class for AST rules.
+
+    Subclasses set `code` and `description` and define enter_<NodeType>
+    and/or leave_<NodeType> methods, e.g. enter_FunctionDef(node, ctx).
+    A fresh instance is created for every file, so rules may keep
+    per-file state on self. Thresholds come from the engine config via
+    self.option(name, default).
+    """
+
+    code = 'X000'
+    description = ''
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or {}
+
+    def option(self, name: str, default: Any) -> Any:
+        """Read a setting from the engine config."""
+        return self.config.get(name, default)
+
+    def finish(self, ctx: 'FileContext'):
+        """Called once after the whole file has been walked."""
+
+
+class FileContext:
+    """
+    What rules see of the file being checked.
+
+    Attributes:
+        path: File path
+        lines: Source lines
+        parents: Ancestors of the current node, innermost last
+        violations: Reported problems
+        functions: Per-function metrics keyed by function node
+    """
+
+    def __init__(self, path: str, source: str):
+        self.path = path
+        self.lines = source.splitlines()
+        self.parents: List[ast.AST] = []
+        self.violations: List[Dict[str, Any]] = []
+        self.functions: Dict[ast.AST, Dict[str, Any]] = {}
+
+    def report(self, node: ast.AST, code: str, message: str):
+        """Record a violation at a node."""
+        self.violations.append({
+            'path': self.path,
+            'line': getattr(node, 'lineno', 1),
+            'col': getattr(node, 'col_offset', 0) + 1,
+            'code': code,
+            'message': message,
+        })
+
+    def qualname(self, node: ast.AST) -> str:
+        """Dotted name of a function or class, including enclosing scopes."""
+        names = [parent.name for parent in self.parents
+                 if isinstance(parent, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef))]
+        return '.'.join(names + [node.name])
+
+    def function_metrics(self, node: ast.AST) -> Dict[str, Any]:
+        """Metrics record for a function node, created on first use."""
+        metrics = self.functions.get(node)
+        if metrics is None:
+            metrics = {'name': self.qualname(node), 'line': node.lineno}
+            self.functions[node] = metrics
+        return metrics
+
+
+def walk(tree: ast.AST, ctx: FileContext, rules: List[Rule]):
+    """
+    Walk the tree once, dispatching each node to the rules that handle it.
+
+    Handlers are resolved per node type up front, so a node type no rule
+    cares about costs one dict lookup.
+    """
+    enter: Dict[str, list] = {}
+    leave: Dict[str, list] = {}
+    for rule in rules:
+        for attr in dir(rule):
+            if attr.startswith('enter_'):
+                enter.setdefault(attr[6:], []).append(getattr(rule, attr))
+            elif attr.startswith('leave_'):
+                leave.setdefault(attr[6:], []).append(getattr(rule, attr))
+
+    parents = ctx.parents
+    stack = [(tree, False)]
+    while stack:
+        node, leaving = stack.pop()
+        name = type(node).__name__
+        if leaving:
+            parents.pop()
+            for handler in leave.get(name, ()):
+                handler(node, ctx)
+            continue
+        for handler in enter.get(name, ()):
+            handler(node, ctx)
+        stack.append((node, True))
+        parents.append(node)
+        children = list(ast.iter_child_nodes(node))
+        children.reverse()
+        stack.extend((child, False) for child in children)
+
+    for rule in rules:
+        rule.finish(ctx)
+
+
+def check_source(source: str, path: str, codes: Iterable[str],
+                 config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Parse source once and run the selected rules over it.
+
+    Returns:
+        Dict with path, violations (sorted by position) and functions
+        (per-function metrics); a syntax error is reported as E999
+    """
+    ctx = FileContext(path, source)
+    try:
+        tree = ast.parse(source, filename=path)
+    except SyntaxError as e:
+        ctx.violations.append({'path': path, 'line': e.lineno or 1, 'col': e.offset or 1,
+                               'code': 'E999', 'message': f"SyntaxError: {e.msg}"})
+        return {'path': path, 'violations': ctx.violations, 'functions': []}
+
+    rules = [RULES[code](config) for code in codes]
+    walk(tree, ctx, rules)
+    ctx.violations.sort(key=lambda v: (v['line'], v['col'], v['code']))
+    functions = sorted(ctx.functions.values(), key=lambda m: m['line'])
+    return {'path': path, 'violations': ctx.violations, 'functions': functions}
+
+
+def _check_file(path: str, codes: List[str], config: Dict[str, Any],
+                modules: List[str]) -> Dict[str, Any]:
+    """Worker entry point: import rule modules, then check one file."""
+    for module in modules:
+        importlib.import_module(module)
+    try:
+        with open(path, 'rb') as f:
+            source = f.read().decode('utf-8', errors='replace')
+    except OSError as e:
+        return {'path': path, 'functions': [], 'violations': [
+            {'path': path, 'line': 1, 'col': 1, 'code': 'E902', 'message': str(e)}]}
+    return check_source(source, path, codes, config)
+
+
+def rules_fingerprint(codes: List[str], config: Dict[str, Any],
+                      modules: List[str]) -> str:
+    """Hash of everything besides file content that affects results."""
+    hasher = hashlib.sha256(f"{ENGINE_VERSION}\0{','.join(sorted(codes))}\0".encode('utf-8'))
+    hasher.update(json.dumps(config, sort_keys=True, default=str).encode('utf-8'))
+    for module in sorted(set(modules) | {__name__}):
+        source_file = getattr(sys.modules.get(module), '__file__', None)
+        if source_file:
+            hasher.update(file_digest(source_file).encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def check_files(
+    paths: List[str],
+    codes: List[str],
+    config: Optional[Dict[str, Any]] = None,
+    modules: Optional[List[str]] = None,
+    jobs: int = 1,
+    cache: Optional[ResultCache] = None,
+    section: str = 'rules'
+) -> List[Dict[str, Any]]:
+    """
+    Check many files, in parallel and with a content-hash cache.
+
+    Args:
+        paths: Python files to check
+        codes: Rule codes to run (see RULES)
+        config: Rule thresholds and options
+        modules: Modules that define the rules; imported in each worker so
+            rules resolve on every multiprocessing start method
+        jobs: Worker processes (parsing is CPU-bound, so threads would not help)
+        cache: Optional ResultCache; results of unchanged files are reused
+        section: Cache section, so different tools can share one cache file
+
+    Returns:
+        Per-file result dicts (see check_source) in the order of paths
+    """
+    config = config or {}
+    modules = list(modules or [])
+    for module in modules:
+        importlib.import_module(module)
+    context = rules_fingerprint(codes, config, modules)
+
+    results = {}
+    digests = {}
+    pending = []
+    for path in paths:
+        if cache is not None:
+            digests[path] = file_digest(path)
+            cached = cache.get(section, path, digests[path], context)
+            if cached is not None:
+                results[path] = cached
+                continue
+        pending.append(path)
+
+    if jobs > 1 and len(pending) >= MIN_PARALLEL_FILES:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunksize = max(1, len(pending) // (jobs * 4))
+            fresh = pool.map(_check_file, pending, [codes] * len(pending),
+                             [config] * len(pending), [modules] * len(pending),
+                             chunksize=chunksize)
+            results.update(zip(pending, fresh))
+    else:
+        for path in pending:
+            results[path] = _check_file(path, codes, config, modules)
+
+    if cache is not None:
+        for path in pending:
+            cache.put(section, path, digests[path], context, results[path])
+        # Callers may check any subset, so only forget files that are gone
+        cache.prune(section, [p for p in cache.tools.get(section, {})
+                              if os.path.exists(p)])
+    return [results[path] for path in paths]
+
+
+def python_files(targets: List[str]) -> List[str]:
+    """Expand files and directories into a sorted list of Python files."""
+    files = set()
+    for target in targets:
+        if os.path.isdir(target):
+            for dirpath, dirnames, filenames in os.walk(target):
+                dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+                files.update(os.path.normpath(os.path.join(dirpath, name))
+                             for name in filenames if name.endswith('.py'))
+        elif target.endswith('.py') and os.path.isfile(target):
+            files.add(os.path.normpath(target))
+    return sorted(files)
@@ -2,79 +2,774 @@
 """
 Dependency checker for multiple package managers.
 Analyzes and reports dependency status across npm, pip, go mod, etc.
+
+A single walk discovers every project under the given root (a monorepo
+or a lone project), lockfiles are parsed directly, and each distinct
+package is looked up once no matter how many projects use it.
 """
 
+import argparse
+import functools
+import hashlib
 import json
-import subprocess
-import sys
+import os
+import re
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
 from pathlib import Path
 
+try:
+    from packaging.version import InvalidVersion, Version
+except ImportError:
+    Version = None
+
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+DEFAULT_PYPI_URL = "https://pypi.org/pypi"
+DEFAULT_NPM_REGISTRY = "https://registry.npmjs.org"
+DEFAULT_GO_PROXY = "https://proxy.golang.org"
+DEFAULT_CRATES_URL = "https://crates.io/api/v1/crates"
+CACHE_NAME = ".deps-cache.json"
+# Latest versions are re-fetched after this many seconds
+DEFAULT_TTL = 6 * 60 * 60
+REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+REQUIREMENT_PIN = re.compile(r"===?\s*([^\s,;]+)")
+TOML_NAME_VERSION = re.compile(r'^(name|version)\s*=\s*"([^"]*)"')
+
+# Dependency, VCS and build output directories never hold projects of their own
+SKIP_DIRS = {".git", ".hg", ".svn", "node_modules", ".venv", "venv", ".tox",
+             "__pycache__", "target", "vendor"}
+# Manifest file name -> ecosystem
+MANIFESTS = {
+    "package.json": "npm",
+    "requirements.txt": "pypi",
+    "pyproject.toml": "pypi",
+    "go.mod": "go",
+    "Cargo.toml": "crates",
+}
+LOCKFILES = {
+    "npm": "package-lock.json",
+    "pypi": "poetry.lock",
+    "go": "go.sum",
+    "crates": "Cargo.lock",
+}
+# npm and Cargo workspaces share one lockfile at the workspace root
+WORKSPACE_LOCKS = {"npm", "crates"}
+ICONS = {"npm": "📦", "pypi": "🐍", "go": "🐹", "crates": "🦀"}
+
+
+def index_url(location):
+    """
+    Normalize an index location to a base URL.
+
+    Accepts http(s) and file URLs as well as plain directory paths, so a
+    fixture directory laid out like the index can stand in for it.
+    """
+    if "://" not in location:
+        return Path(location).resolve().as_uri()
+    return location.rstrip("/")
+
+
+def fetch_json(url, timeout=10):
+    """GET a URL (http, https or file) and parse the body as JSON."""
+    # crates.io rejects requests without a User-Agent
+    request = urllib.request.Request(url, headers={"Accept": "application/json",
+                                                   "User-Agent": "check_deps.py"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.load(response)
+
+
+def latest_pypi(name, index=DEFAULT_PYPI_URL, timeout=10):
+    """Latest version of a PyPI project via the JSON API (<index>/<name>/json)."""
+    data = fetch_json(f"{index}/{urllib.parse.quote(name)}/json", timeout)
+    return data["info"]["version"]
+
+
+def latest_npm(name, registry=DEFAULT_NPM_REGISTRY, timeout=10):
+    """Latest version of an npm package (<registry>/<name>/latest)."""
+    data = fetch_json(f"{registry}/{urllib.parse.quote(name, safe='@')}/latest", timeout)
+    return data["version"]
+
+
+def latest_go(module, proxy=DEFAULT_GO_PROXY, timeout=10):
+    """Latest version of a Go module from a module proxy (<proxy>/<module>/@latest)."""
+    # The proxy protocol escapes capitals as "!" plus the lowercase letter
+    escaped = re.sub(r"[A-Z]", lambda m: "!" + m.group(0).lower(), module)
+    data = fetch_json(f"{proxy}/{urllib.parse.quote(escaped, safe='/!')}/@latest", timeout)
+    return data["Version"]
+
+
+def latest_crate(name, api=DEFAULT_CRATES_URL, timeout=10):
+    """Latest stable version of a crate via the crates.io API (<api>/<name>)."""
+    crate = fetch_json(f"{api}/{urllib.parse.quote(name)}", timeout)["crate"]
+    return crate.get("max_stable_version") or crate["max_version"]
+
+
+FETCHERS = {
+    "npm": latest_npm,
+    "pypi": latest_pypi,
+    "go": latest_go,
+    "crates": latest_crate,
+}
+
+
+def release_tuple(version):
+    """Numeric release segments of a version string, e.g. (1, 2, 3)."""
+    return tuple(int(part) for part in re.findall(r"\d+", version.split("-")[0])[:4])
+
+
+def is_newer(latest, current):
+    """True if latest is a higher version than current; uses packaging when available."""
+    if Version is not None:
+        try:
+            return Version(latest) > Version(current)
+        except InvalidVersion:
+            pass
+    return release_tuple(latest) > release_tuple(current)
+
+
+def canonical_name(ecosystem, name):
+    """Name used to match and look up a package (PEP 503 normalization for PyPI)."""
+    if ecosystem == "pypi":
+        return re.sub(r"[-_.]+", "-", name).lower()
+    return name
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+class LatestVersionCache:
+    """
+    Latest-version lookups with a time-to-live.
+
+    Entries are keyed on ecosystem, index URL and package name, so a
+    package shared by many projects is fetched once per TTL, adding a
+    dependency only looks up the new package, and pointing at another
+    index triggers fresh lookups.
+    """
+
+    def __init__(self, cache_path, ttl=DEFAULT_TTL):
+        """Load the cache, ignoring it if missing or unreadable."""
+        self.cache_path = Path(cache_path)
+        self.ttl = ttl
+        try:
+            self.entries = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, key, default=None):
+        """Return the cached latest version, or default if absent or expired."""
+        entry = self.entries.get(key)
+        if entry and time.time() - entry["fetched"] < self.ttl:
+            return entry["latest"]
+        return default
+
+    def put(self, key, latest):
+        """Remember a latest version (None for packages the index lacks)."""
+        self.entries[key] = {"fetched": time.time(), "latest": latest}
+
+    def save(self):
+        """Drop expired entries and atomically write the cache to disk."""
+        now = time.time()
+        self.entries = {k: v for k, v in self.entries.items()
+                        if now - v["fetched"] < self.ttl}
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.entries, indent=2, sort_keys=True),
+                            encoding="utf-8")
+        os.replace(tmp_path, self.cache_path)
+
+
+def lookup_latest(names, fetch, jobs=8):
+    """
+    Look up the latest version of many packages concurrently.
+
+    Args:
+        names: Package names
+        fetch: Function returning the latest version for one name
+        jobs: Concurrent lookups
+
+    Returns:
+        ({name: latest}, {name: error message}) tuple; packages the index
+        does not have map to None
+    """
+    def job(name):
+        try:
+            return name, fetch(name), None
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return name, None, None
+            return name, None, str(e)
+        except urllib.error.URLError as e:
+            # A fixture directory without the package reads like a 404
+            if isinstance(e.reason, FileNotFoundError):
+                return name, None, None
+            return name, None, str(e)
+        except Exception as e:
+            return name, None, str(e)
+
+    latest, errors = {}, {}
+    names = sorted(set(names))
+    if not names:
+        return latest, errors
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(names)))) as pool:
+        for name, version, error in pool.map(job, names):
+            if error:
+                errors[name] = error
+            else:
+                latest[name] = version
+    return latest, errors
+
+
+def cached_latest(ecosystem, index, names, fetch, cache=None, jobs=8):
+    """
+    Latest versions for names, fetching only those not cached.
+
+    Lookups that failed are reported but not cached, so they are retried
+    on the next run.
+    """
+    missing = object()
+    latest, pending = {}, []
+    for name in set(names):
+        version = cache.get(f"{ecosystem}|{index}|{name}", missing) if cache else missing
+        if version is missing:
+            pending.append(name)
+        else:
+            latest[name] = version
+
+    fetched, errors = lookup_latest(pending, fetch, jobs)
+    latest.update(fetched)
+    if cache is not None:
+        for name, version in fetched.items():
+            cache.put(f"{ecosystem}|{index}|{name}", version)
+    return latest, errors
+
+
+class JSONStream:
+    """
+    Pull parser over a JSON text file that decodes one value at a time.
+
+    Only the value being decoded and one read chunk are held in memory,
+    so a large package-lock.json can be walked entry by entry.
+    """
+
+    def __init__(self, f, chunk_size=1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        """Append the next chunk to the unread buffer; False at end of file."""
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, or "" at end of file."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        """Consume char, which must be the next non-whitespace character."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r}, found {found or 'end of file'!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode and consume the next complete value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number cut off by the chunk boundary may continue in the next one
+            if (isinstance(value, (int, float))
+                    and not self.buffer[end:].strip("0123456789.eE+-") and self._fill()):
+                continue
+            self.pos = end
+            return value
+
+    def keys(self):
+        """
+        Iterate over the keys of the object at the current position.
+
+        The caller consumes each member's value (value() or a nested
+        keys()) before asking for the next key.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+            else:
+                self.expect("}")
+                return
+
+
+def iter_package_lock(path):
+    """
+    Stream (name, version) pairs from package-lock.json.
+
+    Reads lockfile v2/v3 "packages" entries directly under node_modules/
+    (nested copies skipped) and v1 "dependencies" entries.
+    """
+    with open(path, encoding="utf-8") as f:
+        stream = JSONStream(f)
+        for section in stream.keys():
+            if section not in ("packages", "dependencies"):
+                stream.value()
+                continue
+            for key in stream.keys():
+                info = stream.value()
+                if section == "packages":
+                    if not key.startswith("node_modules/") or "/node_modules/" in key:
+                        continue
+                    key = key[len("node_modules/"):]
+                if isinstance(info, dict) and info.get("version"):
+                    yield key, info["version"]
+
+
+def iter_toml_packages(path):
+    """
+    Stream (name, version) pairs from the [[package]] tables of
+    poetry.lock or Cargo.lock, line by line.
+    """
+    name = version = None
+    in_package = False
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("["):
+                if in_package and name and version:
+                    yield name, version
+                in_package = line == "[[package]]"
+                name = version = None
+            elif in_package:
+                match = TOML_NAME_VERSION.match(line)
+                if match and match.group(1) == "name":
+                    name = match.group(2)
+                elif match:
+                    version = match.group(2)
+    if in_package and name and version:
+        yield name, version
 
-def check_npm_deps():
-    """Check npm dependencies for outdated packages."""
-    if not Path("package.json").exists():
+
+def iter_go_sum(path):
+    """Stream (module, version) pairs from go.sum, skipping go.mod-only hashes."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and not parts[1].endswith("/go.mod"):
+                yield parts[0], parts[1]
+
+
+LOCK_PARSERS = {
+    "package-lock.json": iter_package_lock,
+    "poetry.lock": iter_toml_packages,
+    "go.sum": iter_go_sum,
+    "Cargo.lock": iter_toml_packages,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def read_lockfile(path, ecosystem):
+    """
+    Locked versions by canonical name.
+
+    Cached per path, since workspace members share their root's lockfile.
+    When a package is locked at several versions the highest wins.
+    """
+    versions = {}
+    for name, version in LOCK_PARSERS[os.path.basename(path)](path):
+        name = canonical_name(ecosystem, name)
+        if name not in versions or is_newer(version, versions[name]):
+            versions[name] = version
+    return versions
+
+
+def find_lockfile(project_dir, ecosystem, root):
+    """
+    Lockfile for a project, or None.
+
+    npm and Cargo workspace members are locked at the workspace root, so
+    for those the search continues upward as far as root.
+    """
+    parts = Path(os.path.relpath(project_dir, root)).parts
+    depths = range(len(parts), -1, -1) if ecosystem in WORKSPACE_LOCKS else [len(parts)]
+    for depth in depths:
+        candidate = os.path.join(root, *parts[:depth], LOCKFILES[ecosystem])
+        if os.path.isfile(candidate):
+            return os.path.normpath(candidate)
+    return None
+
+
+def discover_projects(root):
+    """
+    Find every project under root in a single directory walk.
+
+    Directories in SKIP_DIRS are pruned before descending, so vendored
+    node_modules, virtualenvs and build output are never listed.
+
+    Returns:
+        Sorted list of (directory, ecosystem) pairs
+    """
+    projects = set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for name in filenames:
+            if name in MANIFESTS:
+                projects.add((os.path.normpath(dirpath), MANIFESTS[name]))
+    return sorted(projects)
+
+
+def parse_requirement(spec):
+    """(name, pinned version or None) for a PEP 508 requirement string."""
+    match = REQUIREMENT_NAME.match(spec)
+    if not match:
+        return None, None
+    pin = REQUIREMENT_PIN.search(spec.split(";", 1)[0])
+    exact = pin and "," not in spec and "*" not in pin.group(1)
+    return match.group(1), pin.group(1) if exact else None
+
+
+def parse_requirements(path):
+    """{name: pinned version or None} for a requirements file (options and URLs skipped)."""
+    requirements = {}
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line or line.startswith("-") or "://" in line:
+            continue
+        name, pinned = parse_requirement(line)
+        if name:
+            requirements[name] = pinned
+    return requirements
+
+
+def read_toml(path):
+    """Parse a TOML manifest (requires Python 3.11+ for tomllib)."""
+    if tomllib is None:
+        raise ValueError(f"{path}: reading TOML requires Python 3.11+")
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def pyproject_requirements(path):
+    """{name: pinned version or None} from PEP 621 and Poetry tables of pyproject.toml."""
+    data = read_toml(path)
+    requirements = {}
+    project = data.get("project", {})
+    specs = list(project.get("dependencies", []))
+    for extra in project.get("optional-dependencies", {}).values():
+        specs.extend(extra)
+    for spec in specs:
+        name, pinned = parse_requirement(spec)
+        if name:
+            requirements[name] = pinned
+
+    poetry = data.get("tool", {}).get("poetry", {})
+    tables = [poetry.get("dependencies", {}), poetry.get("dev-dependencies", {})]
+    tables += [group.get("dependencies", {}) for group in poetry.get("group", {}).values()]
+    for table in tables:
+        for name, spec in table.items():
+            # Path and VCS dependencies are not on the index
+            if name != "python" and not (isinstance(spec, dict) and
+                                         {"path", "git", "url"} & set(spec)):
+                requirements.setdefault(name, None)
+    return requirements
+
+
+def npm_requirements(path):
+    """{name: None} for registry dependencies in package.json."""
+    manifest = json.loads(Path(path).read_text(encoding="utf-8"))
+    requirements = {}
+    for section in ("dependencies", "devDependencies", "optionalDependencies"):
+        for name, spec in manifest.get(section, {}).items():
+            # Local, workspace and git dependencies are not on the registry
+            if not re.match(r"(file|link|workspace|git\+?\w*|github):|\.{0,2}/", str(spec)):
+                requirements[name] = None
+    return requirements
+
+
+def go_requirements(path):
+    """{module: version} for direct requirements in go.mod (// indirect skipped)."""
+    requirements = {}
+    in_block = False
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line.startswith("require ("):
+            in_block = True
+            continue
+        if in_block and line.startswith(")"):
+            in_block = False
+            continue
+        if line.startswith("require "):
+            line = line[len("require "):]
+        elif not in_block:
+            continue
+        parts = line.split()
+        if len(parts) >= 2 and "// indirect" not in line:
+            requirements[parts[0]] = parts[1]
+    return requirements
+
+
+def cargo_requirements(path):
+    """{crate: None} for registry dependencies in Cargo.toml (path and git skipped)."""
+    data = read_toml(path)
+    tables = [data.get(section, {}) for section in
+              ("dependencies", "dev-dependencies", "build-dependencies")]
+    tables.append(data.get("workspace", {}).get("dependencies", {}))
+    for target in data.get("target", {}).values():
+        tables.extend(target.get(section, {}) for section in
+                      ("dependencies", "dev-dependencies", "build-dependencies"))
+
+    requirements = {}
+    for table in tables:
+        for name, spec in table.items():
+            if isinstance(spec, dict):
+                if {"path", "git"} & set(spec):
+                    continue
+                name = spec.get("package", name)
+            requirements[name] = None
+    return requirements
+
+
+def installed_python_version(name):
+    """Installed version of a distribution in this interpreter, or None."""
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
         return None
 
+
+def installed_npm_version(project_dir, name):
+    """Version from node_modules/<name>/package.json, or None."""
     try:
-        result = subprocess.run(
-            ["npm", "outdated", "--json"],
-            capture_output=True,
-            text=True
-        )
-        if result.stdout:
-            return json.loads(result.stdout)
-        return {}
-    except Exception as e:
-        return {"error": str(e)}
-
-
-def check_pip_deps():
-    """Check pip dependencies for outdated packages."""
-    if not Path("requirements.txt").exists():
+        manifest = Path(project_dir) / "node_modules" / name / "package.json"
+        return json.loads(manifest.read_text(encoding="utf-8")).get("version")
+    except (OSError, ValueError):
         return None
 
+
+def analyze_project(project_dir, ecosystem, root="."):
+    """
+    Read one project's direct dependencies and their current versions.
+
+    Current versions come from the lockfile, then from exact pins in the
+    manifest, then from what is installed (node_modules, or this
+    interpreter for Python). Go is the exception: the go.mod require
+    comes first and go.sum is the fallback. Nothing is executed and
+    nothing is fetched.
+
+    Returns:
+        Dict with path, ecosystem, lockfile, dependencies ({name: current
+        version or None}) and error
+    """
+    project = {"path": project_dir, "ecosystem": ecosystem, "lockfile": None,
+               "dependencies": {}, "error": None}
+    directory = Path(project_dir)
     try:
-        result = subprocess.run(
-            ["pip", "list", "--outdated", "--format=json"],
-            capture_output=True,
-            text=True
-        )
-        if result.stdout:
-            return json.loads(result.stdout)
-        return []
-    except Exception as e:
-        return {"error": str(e)}
+        if ecosystem == "npm":
+            requirements = npm_requirements(directory / "package.json")
+        elif ecosystem == "go":
+            requirements = go_requirements(directory / "go.mod")
+        elif ecosystem == "crates":
+            requirements = cargo_requirements(directory / "Cargo.toml")
+        else:
+            requirements = {}
+            if (directory / "requirements.txt").is_file():
+                requirements.update(parse_requirements(directory / "requirements.txt"))
+            if (directory / "pyproject.toml").is_file():
+                for name, pinned in pyproject_requirements(directory / "pyproject.toml").items():
+                    requirements[name] = requirements.get(name) or pinned
 
+        lockfile = find_lockfile(project_dir, ecosystem, root)
+        locked = read_lockfile(lockfile, ecosystem) if lockfile else {}
+    except (OSError, ValueError, AttributeError, TypeError) as e:
+        project["error"] = str(e)
+        return project
 
-def main():
-    """Run dependency checks for all detected package managers."""
-    print("🔍 Checking dependencies...\n")
-
-    # Check npm
-    npm_deps = check_npm_deps()
-    if npm_deps is not None:
-        print("📦 NPM Dependencies:")
-        if isinstance(npm_deps, dict) and "error" in npm_deps:
-            print(f"  ❌ Error: {npm_deps['error']}")
-        elif npm_deps:
-            for pkg, info in npm_deps.items():
-                print(f"  ⚠️  {pkg}: {info.get('current')} → {info.get('latest')}")
+    project["lockfile"] = lockfile
+    for name, pinned in requirements.items():
+        name = canonical_name(ecosystem, name)
+        if ecosystem == "go":
+            # go.mod's require is the selected version; go.sum also keeps
+            # hashes for older versions, so it is only a fallback
+            current = pinned or locked.get(name)
         else:
-            print("  ✅ All packages up to date")
-        print()
-
-    # Check pip
-    pip_deps = check_pip_deps()
-    if pip_deps is not None:
-        print("🐍 Python Dependencies:")
-        if isinstance(pip_deps, dict) and "error" in pip_deps:
-            print(f"  ❌ Error: {pip_deps['error']}")
-        elif pip_deps:
-            for pkg in pip_deps:
-                print(f"  ⚠️  {pkg['name']}: {pkg['version']} → {pkg['latest_version']}")
+            current = locked.get(name) or pinned
+        if current is None and ecosystem == "npm":
+            current = installed_npm_version(directory, name)
+        elif current is None and ecosystem == "pypi":
+            current = installed_python_version(name)
+        project["dependencies"][name] = current
+    return project
+
+
+def scan(root, indexes, cache=None, jobs=8, timeout=10):
+    """
+    Check every project under root and merge the results into one report.
+
+    Projects are analyzed in parallel, then the union of their package
+    names is looked up once per ecosystem, with all ecosystems querying
+    their indexes at the same time.
+
+    Args:
+        root: Directory to scan
+        indexes: {ecosystem: index base URL}
+        cache: Optional LatestVersionCache
+        jobs: Concurrent file reads and lookups per ecosystem
+        timeout: Seconds per index request
+
+    Returns:
+        Report dict with root, projects (each with its outdated packages and
+        those whose current version is unknown) and summary counts
+    """
+    discovered = discover_projects(root)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        projects = list(pool.map(lambda p: analyze_project(p[0], p[1], root), discovered))
+
+    wanted = {}
+    for project in projects:
+        wanted.setdefault(project["ecosystem"], set()).update(project["dependencies"])
+
+    def lookup(ecosystem):
+        index, fetch = indexes[ecosystem], FETCHERS[ecosystem]
+        return ecosystem, cached_latest(ecosystem, index, wanted[ecosystem],
+                                        lambda name: fetch(name, index, timeout), cache, jobs)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(wanted))) as pool:
+        results = dict(pool.map(lookup, sorted(wanted)))
+
+    outdated_total = unknown_total = 0
+    for project in projects:
+        latest, errors = results.get(project["ecosystem"], ({}, {}))
+        outdated, unknown = [], []
+        for name, current in sorted(project["dependencies"].items()):
+            if current is None:
+                # No lockfile entry, pin or install to compare against
+                unknown.append({"name": name, "latest": latest.get(name)})
+            elif latest.get(name) and is_newer(latest[name], current):
+                outdated.append({"name": name, "current": current, "latest": latest[name]})
+        project["outdated"] = outdated
+        project["unknown"] = unknown
+        project["lookup_errors"] = {name: errors[name]
+                                    for name in project["dependencies"] if name in errors}
+        outdated_total += len(outdated)
+        unknown_total += len(unknown)
+
+    return {
+        "root": root,
+        "projects": projects,
+        "summary": {
+            "projects": len(projects),
+            "dependencies": sum(len(p["dependencies"]) for p in projects),
+            "lookups": sum(len(names) for names in wanted.values()),
+            "outdated": outdated_total,
+            "unknown": unknown_total,
+        },
+    }
+
+
+def print_report(report):
+    """Print the merged report, one block per project."""
+    summary = report["summary"]
+    print(f"🔍 Checked {summary['projects']} project(s) under {report['root']}\n")
+
+    for project in report["projects"]:
+        lockfile = f", {project['lockfile']}" if project["lockfile"] else ""
+        header = (f"{ICONS[project['ecosystem']]} {project['path']} "
+                  f"({project['ecosystem']}{lockfile})")
+        if project["error"]:
+            print(f"{header}\n  ❌ Error: {project['error']}")
+        elif project["outdated"] or project["unknown"] or project["lookup_errors"]:
+            print(header)
+            for pkg in project["outdated"]:
+                print(f"  ⚠️  {pkg['name']}: {pkg['current']} → {pkg['latest']}")
+            for pkg in project["unknown"]:
+                latest = f" (latest {pkg['latest']})" if pkg["latest"] else ""
+                print(f"  ❓ {pkg['name']}: current version unknown{latest}")
+            for name, error in sorted(project["lookup_errors"].items()):
+                print(f"  ❌ {name}: {error}")
         else:
-            print("  ✅ All packages up to date")
-        print()
+            print(f"{header}\n  ✅ All {len(project['dependencies'])} packages up to date")
+
+    print(f"\n{summary['dependencies']} dependencies, {summary['lookups']} unique "
+          f"lookups, {summary['outdated']} outdated, {summary['unknown']} unknown")
+
+
+def main():
+    """Run dependency checks for every project under the given directory."""
+    parser = argparse.ArgumentParser(description="Check dependencies for outdated packages")
+    parser.add_argument("root", nargs="?", default=".",
+                        help="Project or monorepo directory to scan (default: .)")
+    parser.add_argument("--pypi-url", default=DEFAULT_PYPI_URL,
+                        help="PyPI JSON API base URL, mirror or fixture directory "
+                             "(<url>/<name>/json)")
+    parser.add_argument("--npm-registry", default=DEFAULT_NPM_REGISTRY,
+                        help="npm registry URL, mirror or fixture directory "
+                             "(<url>/<name>/latest)")
+    parser.add_argument("--go-proxy", default=DEFAULT_GO_PROXY,
+                        help="Go module proxy URL or fixture directory "
+                             "(<url>/<module>/@latest)")
+    parser.add_argument("--crates-url", default=DEFAULT_CRATES_URL,
+                        help="crates.io API URL or fixture directory (<url>/<name>)")
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL,
+                        help=f"Seconds to reuse cached lookups (default: {DEFAULT_TTL})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Always query the index and ignore {CACHE_NAME}")
+    parser.add_argument("-j", "--jobs", type=int, default=8,
+                        help="Concurrent file reads and index lookups (default: 8)")
+    parser.add_argument("--timeout", type=float, default=10,
+                        help="Seconds per index request (default: 10)")
+    parser.add_argument("--json", action="store_true",
+                        help="Print a JSON report")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.root):
+        parser.error(f"directory not found: {args.root}")
+    locations = {"pypi": args.pypi_url, "npm": args.npm_registry,
+                 "go": args.go_proxy, "crates": args.crates_url}
+    for location in locations.values():
+        if "://" not in location and not os.path.isdir(location):
+            parser.error(f"index directory not found: {location}")
+
+    cache = None if args.no_cache else LatestVersionCache(CACHE_NAME, args.ttl)
+    indexes = {ecosystem: index_url(location) for ecosystem, location in locations.items()}
+    report = scan(args.root, indexes, cache, args.jobs, args.timeout)
+    if cache is not None:
+        cache.save()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
 
 
 if __name__ == "__main__":
@@ -3,80 +3,697 @@
 Find duplicate files using hash comparison.
 """
 
+import argparse
+import errno
+import fnmatch
 import hashlib
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from collections import defaultdict
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
-def hash_file(filepath):
-    """Generate MD5 hash of a file."""
-    hasher = hashlib.md5()
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# ioctl request to clone a file's extents (linux/fs.h)
+FICLONE = 0x40049409
+
+
+class HashCache:
+    """
+    On-disk index of file digests keyed by (device, inode).
+
+    An entry is only reused when the file's size and mtime still match
+    what was recorded, so unchanged files are never read again. Entries
+    for files that have disappeared are pruned on save. With no
+    cache_path the index lives in memory for a single run.
+    """
+
+    def __init__(self, cache_path=None):
+        """
+        Load the cache from disk.
+
+        Args:
+            cache_path: JSON file holding the index (created if missing)
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.entries = {}
+        self.seen = set()
+        self.hits = 0
+        self.misses = 0
+
+        if self.cache_path and self.cache_path.exists():
+            try:
+                data = json.loads(self.cache_path.read_text(encoding='utf-8'))
+                self.entries = data.get('entries', {})
+            except (OSError, ValueError):
+                print(f"[!] Ignoring unreadable hash cache: {self.cache_path}",
+                      file=sys.stderr)
+
+    @staticmethod
+    def _key(st):
+        return f"{st.st_dev}:{st.st_ino}"
+
+    def _entry(self, st):
+        """Return the entry for a stat result if it is still current."""
+        entry = self.entries.get(self._key(st))
+        if (entry and entry['size'] == st.st_size
+                and entry['mtime_ns'] == st.st_mtime_ns):
+            return entry
+        return None
+
+    def get(self, st, kind):
+        """
+        Return the cached digest of the given kind, or None if stale.
+
+        kind names the algorithm and stage, e.g. "blake2b" or
+        "blake2b:sample:65536".
+        """
+        self.seen.add(self._key(st))
+        entry = self._entry(st)
+        if entry and kind in entry:
+            self.hits += 1
+            return entry[kind]
+        self.misses += 1
+        return None
+
+    def put(self, filepath, st, digest, kind):
+        """Record a digest of a file alongside its identifying stat fields."""
+        key = self._key(st)
+        self.seen.add(key)
+        entry = self._entry(st)
+        if entry is None:
+            entry = self.entries[key] = {
+                'path': os.path.abspath(filepath),
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+            }
+        entry[kind] = digest
+
+    def prune(self):
+        """
+        Drop entries for files that no longer exist or have changed.
+
+        Only entries not touched during this run are re-checked, so a
+        cache shared between several directory trees keeps the others.
+        """
+        removed = 0
+        for key in list(self.entries):
+            if key in self.seen:
+                continue
+            entry = self.entries[key]
+            try:
+                st = os.stat(entry['path'])
+            except OSError:
+                st = None
+            if (st is None or self._key(st) != key
+                    or st.st_size != entry['size']
+                    or st.st_mtime_ns != entry['mtime_ns']):
+                del self.entries[key]
+                removed += 1
+        return removed
+
+    def save(self):
+        """Prune stale entries and atomically write the cache to disk."""
+        if not self.cache_path:
+            return
+        self.prune()
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        tmp_path.write_text(
+            json.dumps({'version': 1, 'entries': self.entries}),
+            encoding='utf-8'
+        )
+        os.replace(tmp_path, self.cache_path)
+
+
+BLOCK_SIZE = 1024 * 1024
+SAMPLE_SIZE = 64 * 1024
+MAX_INFLIGHT_BYTES = 256 * 1024 * 1024
+
+# Digest constructors by name; optional backends are only listed when installed
+ALGORITHMS = {
+    'blake2b': hashlib.blake2b,
+    'md5': hashlib.md5,
+    'sha256': hashlib.sha256,
+}
+if xxhash is not None:
+    ALGORITHMS['xxh3_128'] = xxhash.xxh3_128
+if blake3 is not None:
+    ALGORITHMS['blake3'] = blake3.blake3
+
+DEFAULT_ALGORITHM = 'blake2b'
+
+
+def new_hasher(algorithm=DEFAULT_ALGORITHM):
+    """Return a fresh hash object for the named algorithm."""
+    try:
+        return ALGORITHMS[algorithm]()
+    except KeyError:
+        available = ', '.join(sorted(ALGORITHMS))
+        raise ValueError(
+            f"Unknown or unavailable hash algorithm: {algorithm} "
+            f"(available: {available})"
+        ) from None
+
+
+def hash_file(filepath, algorithm=DEFAULT_ALGORITHM, block_size=BLOCK_SIZE):
+    """
+    Generate a hash of a file.
+
+    Reads go through readinto() on a single reused buffer, so no bytes
+    object is allocated per block.
+    """
+    hasher = new_hasher(algorithm)
+    buffer = bytearray(block_size)
+    view = memoryview(buffer)
+    with open(filepath, 'rb', buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            hasher.update(view[:n])
+    return hasher.hexdigest()
+
+
+def hash_sample(filepath, size, sample_size=SAMPLE_SIZE, algorithm=DEFAULT_ALGORITHM):
+    """
+    Generate a hash of the first and last sample_size bytes of a file.
+
+    Files that differ in either sample cannot be identical, so this
+    cheap digest rules out most same-size candidates before a full read.
+    """
+    hasher = new_hasher(algorithm)
     with open(filepath, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hasher.update(chunk)
+        hasher.update(f.read(sample_size))
+        f.seek(max(size - sample_size, 0))
+        hasher.update(f.read(sample_size))
     return hasher.hexdigest()
 
 
-def find_duplicates(directory=".", recursive=True):
+def _matches(name, relpath, patterns):
+    return any(fnmatch.fnmatch(name, p) or fnmatch.fnmatch(relpath, p)
+               for p in patterns)
+
+
+def iter_files(directory=".", recursive=True, include=None, exclude=None,
+               follow_symlinks=False, errors=None):
     """
-    Find duplicate files in a directory.
+    Stream regular files under a directory using os.scandir.
+
+    Each file costs a single stat call whose result is yielded with the
+    path, and only the directories still to visit are kept in memory.
 
     Args:
         directory: Directory to scan
-        recursive: Whether to scan subdirectories
+        recursive: Whether to descend into subdirectories
+        include: Glob patterns a file name or relative path must match
+        exclude: Glob patterns for files and directories to skip
+        follow_symlinks: Follow symlinked files and directories; the
+            (device, inode) pairs of visited directories are tracked so
+            loops are skipped. Files are not deduplicated, so hardlinks
+            still show up as duplicates
+        errors: Optional list collecting (path, OSError) for unreadable entries
+
+    Yields:
+        (path, stat_result) for every matching regular file
+    """
+    include = include or []
+    exclude = exclude or []
+    root = os.fspath(directory)
+    visited = set()
+    # Each pending directory carries its path relative to root for matching
+    stack = [(root, '')]
+
+    if follow_symlinks:
+        st = os.stat(root)
+        visited.add((st.st_dev, st.st_ino))
+
+    while stack:
+        current, prefix = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    relpath = prefix + entry.name
+                    if exclude and _matches(entry.name, relpath, exclude):
+                        continue
+                    try:
+                        if not follow_symlinks and entry.is_symlink():
+                            continue
+                        if entry.is_dir():
+                            if not recursive:
+                                continue
+                            if follow_symlinks:
+                                st = entry.stat()
+                                key = (st.st_dev, st.st_ino)
+                                if key in visited:
+                                    continue
+                                visited.add(key)
+                            subdirs.append((entry.path, relpath + os.sep))
+                        elif entry.is_file():
+                            if include and not _matches(entry.name, relpath, include):
+                                continue
+                            yield entry.path, entry.stat()
+                    except OSError as e:
+                        if errors is not None:
+                            errors.append((entry.path, e))
+        except OSError as e:
+            if errors is not None:
+                errors.append((current, e))
+        # Reverse so directories are visited in scandir order
+        stack.extend(reversed(subdirs))
+
+
+def _run_bounded(tasks, workers=1, max_inflight_bytes=MAX_INFLIGHT_BYTES):
+    """
+    Run hashing tasks on a thread pool and yield results in input order.
+
+    hashlib and file reads release the GIL, so threads scale with the
+    storage. New tasks are only submitted while the bytes still being
+    read stay under max_inflight_bytes. Tasks that fail with OSError
+    (e.g. a file deleted mid-scan) yield None.
+
+    Args:
+        tasks: Iterable of (cost_bytes, func, args) tuples; a func of None
+            passes args through as an already-known result
+        workers: Number of worker threads (1 runs serially)
+        max_inflight_bytes: Upper bound on bytes of work submitted at once
+    """
+    def call(func, args):
+        if func is None:
+            return args
+        try:
+            return func(*args)
+        except OSError:
+            return None
+
+    if workers <= 1:
+        for cost, func, args in tasks:
+            yield call(func, args)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        inflight = {}
+        inflight_bytes = 0
+        done_results = {}
+        next_index = 0
+
+        def drain(block):
+            nonlocal inflight_bytes, next_index
+            if block and inflight:
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+            else:
+                done = [f for f in inflight if f.done()]
+            for future in done:
+                index, cost = inflight.pop(future)
+                inflight_bytes -= cost
+                done_results[index] = future.result()
+            while next_index in done_results:
+                yield done_results.pop(next_index)
+                next_index += 1
+
+        for index, (cost, func, args) in enumerate(tasks):
+            if func is None:
+                done_results[index] = args
+                yield from drain(block=False)
+                continue
+            while inflight and (inflight_bytes + cost > max_inflight_bytes
+                                or len(inflight) >= workers * 4):
+                yield from drain(block=True)
+            future = pool.submit(call, func, args)
+            inflight[future] = (index, cost)
+            inflight_bytes += cost
+            yield from drain(block=False)
+
+        while inflight:
+            yield from drain(block=True)
+
+
+def _hash_stage(groups, plan, cache, workers, max_inflight_bytes):
     """
-    path = Path(directory)
-    files = path.rglob("*") if recursive else path.glob("*")
+    Split candidate groups by digest, dropping unique members.
 
-    print("Scanning for duplicate files...")
-    print()
+    Args:
+        groups: Lists of (file, stat) candidates
+        plan: Callable (file, st) -> (kind, func, args, cost) for a cache miss
+        cache: HashCache consulted before and updated after hashing
+
+    Yields:
+        (digest, group) for every group of two or more matching files,
+        in input order, as soon as all of a group's digests are known
+    """
+    def tasks():
+        for group in groups:
+            for file, st in group:
+                kind, func, args, cost = plan(file, st)
+                digest = cache.get(st, kind)
+                if digest is None:
+                    yield cost, func, args
+                else:
+                    yield 0, None, digest
+
+    # The cache is only touched from this thread; workers just hash
+    results = _run_bounded(tasks(), workers, max_inflight_bytes)
+    for group in groups:
+        by_digest = defaultdict(list)
+        for file, st in group:
+            digest = next(results)
+            if digest is not None:
+                cache.put(file, st, digest, plan(file, st)[0])
+                by_digest[digest].append((file, st))
+        for digest, members in by_digest.items():
+            if len(members) > 1:
+                yield digest, members
+
+
+def iter_duplicates(directory=".", recursive=True, cache_path=None,
+                    sample_size=SAMPLE_SIZE, workers=1,
+                    max_inflight_bytes=MAX_INFLIGHT_BYTES,
+                    algorithm=DEFAULT_ALGORITHM, block_size=BLOCK_SIZE,
+                    include=None, exclude=None, follow_symlinks=False,
+                    stats=None):
+    """
+    Stream sets of identical files without printing anything.
+
+    Candidates are narrowed in stages: by size, then by a digest of the
+    head and tail of each file, and only the survivors are fully hashed.
+    Each set is yielded as soon as its last member has been hashed.
+
+    Args:
+        directory: Directory to scan
+        recursive: Whether to scan subdirectories
+        cache_path: Optional hash cache file; unchanged files are not rehashed
+        sample_size: Bytes read from each end of a file in the sample stage
+        workers: Number of hashing threads (1 hashes serially)
+        max_inflight_bytes: Bound on bytes queued for hashing at once
+        algorithm: Digest algorithm name (see ALGORITHMS)
+        block_size: Read size used when hashing whole files
+        include: Glob patterns a file must match to be considered
+        exclude: Glob patterns for files and directories to skip
+        follow_symlinks: Follow symlinks, guarding against loops
+        stats: Optional dict filled with per-stage candidate counts
+
+    Yields:
+        (digest, [(file, stat), ...]) for each set of duplicates
+    """
+    stats = {} if stats is None else stats
+    new_hasher(algorithm)  # fail fast on an unavailable backend
+    cache = HashCache(cache_path)
+    errors = []
 
     # Group files by size first (faster than hashing)
     by_size = defaultdict(list)
     file_count = 0
-    for file in files:
-        if file.is_file():
-            by_size[file.stat().st_size].append(file)
-            file_count += 1
+    for file, st in iter_files(directory, recursive, include, exclude,
+                               follow_symlinks, errors):
+        by_size[st.st_size].append((file, st))
+        file_count += 1
+    stats['scanned'] = file_count
+    stats['errors'] = errors
 
-    print(f"Scanned {file_count} files...")
+    # Cached digests are keyed by algorithm so switching backends never
+    # compares digests from different hash functions
+    def full_plan(file, st):
+        return algorithm, hash_file, (file, algorithm, block_size), st.st_size
 
-    # Hash files with same size
-    by_hash = defaultdict(list)
-    for size, file_list in by_size.items():
-        if len(file_list) > 1:
-            for file in file_list:
-                file_hash = hash_file(file)
-                by_hash[file_hash].append(file)
+    def sample_plan(file, st):
+        # Small files are read whole here; the full stage then hits the cache
+        if st.st_size <= 2 * sample_size:
+            return full_plan(file, st)
+        return (f'{algorithm}:sample:{sample_size}', hash_sample,
+                (file, st.st_size, sample_size, algorithm), 2 * sample_size)
 
-    # Report duplicates
-    duplicates = {h: files for h, files in by_hash.items() if len(files) > 1}
+    groups = [g for g in by_size.values() if len(g) > 1]
+    stats['size_candidates'] = sum(map(len, groups))
+    groups = [g for _, g in _hash_stage(groups, sample_plan, cache,
+                                        workers, max_inflight_bytes)]
+    stats['sample_candidates'] = sum(map(len, groups))
+    try:
+        yield from _hash_stage(groups, full_plan, cache,
+                               workers, max_inflight_bytes)
+    finally:
+        cache.save()
+        stats['cache_hits'] = cache.hits
+        stats['cache_misses'] = cache.misses
 
-    if not duplicates:
-        print("\n[OK] No duplicate files found")
-        return
 
-    total_wasted = sum(
-        files[0].stat().st_size * (len(files) - 1)
-        for files in duplicates.values()
-    )
-    wasted_mb = total_wasted / (1024 * 1024)
+def collect_duplicates(directory=".", recursive=True, cache_path=None, **options):
+    """
+    Find sets of identical files without printing anything.
+
+    Takes the same arguments as iter_duplicates.
+
+    Returns:
+        Dict mapping digest to a list of (file, stat) tuples
+    """
+    return dict(iter_duplicates(directory, recursive, cache_path, **options))
+
+
+def _same_file_state(path, st):
+    """Check that a file still has the identity, size and mtime seen at scan."""
+    try:
+        current = os.stat(path, follow_symlinks=False)
+    except OSError:
+        return False
+    return (current.st_dev == st.st_dev and current.st_ino == st.st_ino
+            and current.st_size == st.st_size
+            and current.st_mtime_ns == st.st_mtime_ns)
 
-    print(f"\n[!] Found {len(duplicates)} sets of duplicate files")
-    print(f"[!] Wasted space: {wasted_mb:.2f} MB\n")
 
-    for file_hash, files in duplicates.items():
-        size_mb = files[0].stat().st_size / (1024 * 1024)
-        print(f"Duplicate set ({size_mb:.2f} MB each, {len(files)} copies):")
-        for file in files:
+def reflink(src, dst):
+    """Create dst as a copy-on-write clone of src (Linux FICLONE only)."""
+    if fcntl is None or not sys.platform.startswith('linux'):
+        raise OSError(errno.EOPNOTSUPP, "reflinks are only supported on Linux")
+    with open(src, 'rb') as fsrc:
+        fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            fcntl.ioctl(fd, FICLONE, fsrc.fileno())
+        finally:
+            os.close(fd)
+
+
+def link_duplicates(items, mode='hardlink', apply=False):
+    """
+    Replace every copy in a duplicate set with a link to the first file.
+
+    Before acting, both files are re-checked against the size and mtime
+    recorded during the scan, and anything that changed is skipped. The
+    link is made under a temporary name and then renamed over the copy,
+    so the copy's path is never missing.
+
+    Args:
+        items: List of (file, stat) tuples from iter_duplicates
+        mode: "hardlink" or "reflink"
+        apply: If False, only report what would be done
+
+    Returns:
+        List of dicts with path, status ("linked", "would-link" or
+        "skipped"), reason and reclaimed bytes
+    """
+    keep, keep_st = items[0]
+    results = []
+    for path, st in items[1:]:
+        result = {'path': str(path), 'status': 'skipped', 'reason': None, 'reclaimed': 0}
+        results.append(result)
+
+        if (st.st_dev, st.st_ino) == (keep_st.st_dev, keep_st.st_ino):
+            result['reason'] = "already linked"
+            continue
+        if mode == 'hardlink' and st.st_dev != keep_st.st_dev:
+            result['reason'] = "different filesystem"
+            continue
+        if not (_same_file_state(keep, keep_st) and _same_file_state(path, st)):
+            result['reason'] = "changed since scan"
+            continue
+        if not apply:
+            result['status'] = 'would-link'
+            result['reclaimed'] = st.st_size
+            continue
+
+        tmp = f"{path}.dedupe-{os.getpid()}.tmp"
+        try:
+            if mode == 'reflink':
+                reflink(keep, tmp)
+                shutil.copystat(path, tmp)
+            else:
+                os.link(keep, tmp)
+            # Last check right before the swap narrows the race window
+            if not _same_file_state(path, st):
+                raise OSError(errno.EAGAIN, "changed since scan")
+            os.replace(tmp, path)
+        except OSError as e:
+            result['reason'] = e.strerror or str(e)
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            continue
+
+        result['status'] = 'linked'
+        result['reclaimed'] = st.st_size
+    return results
+
+
+def find_duplicates(directory=".", recursive=True, cache_path=None,
+                    output_format="text", action=None, apply=False, **options):
+    """
+    Find duplicate files in a directory.
+
+    Sets are reported as soon as they are confirmed. With output_format
+    "jsonl" each set is written to stdout as one JSON object, followed by
+    a final summary object, and progress messages go to stderr.
+
+    Args:
+        directory: Directory to scan
+        recursive: Whether to scan subdirectories
+        cache_path: Optional hash cache file; unchanged files are not rehashed
+        output_format: "text" or "jsonl"
+        action: None to only report, or "hardlink"/"reflink" to dedupe
+        apply: If False, actions are previewed without touching files
+        **options: Tuning options passed through to iter_duplicates
+            (sample_size, workers, algorithm, include, exclude, ...)
+    """
+    jsonl = output_format == "jsonl"
+    log = sys.stderr if jsonl else sys.stdout
+
+    print("Scanning for duplicate files...", file=log)
+    print(file=log)
+
+    stats = {}
+    set_count = 0
+    total_wasted = 0
+    total_reclaimed = 0
+
+    for digest, items in iter_duplicates(directory, recursive, cache_path,
+                                         stats=stats, **options):
+        size = items[0][1].st_size
+        # Hardlinked copies share storage, so only distinct inodes waste space
+        inodes = {(st.st_dev, st.st_ino) for file, st in items}
+        wasted = size * (len(inodes) - 1)
+        set_count += 1
+        total_wasted += wasted
+        actions = link_duplicates(items, action, apply) if action else []
+        total_reclaimed += sum(a['reclaimed'] for a in actions)
+
+        if jsonl:
+            record = {
+                'type': 'duplicate_set',
+                'digest': digest,
+                'size': size,
+                'count': len(items),
+                'wasted': wasted,
+                'files': [str(file) for file, st in items],
+            }
+            if action:
+                record['actions'] = actions
+            print(json.dumps(record), flush=True)
+            continue
+
+        size_mb = size / (1024 * 1024)
+        print(f"Duplicate set ({size_mb:.2f} MB each, {len(items)} copies):")
+        for file, st in items:
             try:
                 print(f"   - {file}")
             except UnicodeEncodeError:
                 print(f"   - {str(file).encode('ascii', 'replace').decode('ascii')}")
+        for a in actions:
+            if a['status'] == 'skipped':
+                print(f"   [SKIP] {a['path']}: {a['reason']}")
+            else:
+                verb = "Linked" if a['status'] == 'linked' else "Would link"
+                print(f"   [OK] {verb} {a['path']}")
         print()
 
+    print(f"Scanned {stats['scanned']} files...", file=log)
+    print(f"Size filter: {stats['size_candidates']} candidates", file=log)
+    print(f"Sample filter: {stats['sample_candidates']} candidates", file=log)
+    if cache_path:
+        print(f"Hash cache: {stats['cache_hits']} hits, {stats['cache_misses']} misses",
+              file=log)
+    for path, error in stats['errors']:
+        print(f"[!] Skipped {path}: {error.strerror or error}", file=log)
+
+    if jsonl:
+        print(json.dumps({
+            'type': 'summary',
+            'scanned': stats['scanned'],
+            'sets': set_count,
+            'wasted': total_wasted,
+            'reclaimed': total_reclaimed,
+        }))
+        return
+
+    # Report duplicates
+    if not set_count:
+        print("\n[OK] No duplicate files found")
+        return
+
+    wasted_mb = total_wasted / (1024 * 1024)
+    print(f"\n[!] Found {set_count} sets of duplicate files")
+    print(f"[!] Wasted space: {wasted_mb:.2f} MB")
+    if action:
+        reclaimed_mb = total_reclaimed / (1024 * 1024)
+        if apply:
+            print(f"[OK] Reclaimed {reclaimed_mb:.2f} MB with {action}s")
+        else:
+            print(f"[INFO] {action}s would reclaim {reclaimed_mb:.2f} MB; "
+                  f"run with --apply to make changes")
+
 
 if __name__ == "__main__":
-    import sys
-    directory = sys.argv[1] if len(sys.argv) > 1 else "."
-    find_duplicates(directory)
+    parser = argparse.ArgumentParser(description="Find duplicate files")
+    parser.add_argument("directory", nargs="?", default=".",
+                        help="Directory to scan (default: current directory)")
+    parser.add_argument("--no-recursive", action="store_true",
+                        help="Only scan the top-level directory")
+    parser.add_argument("--cache", metavar="PATH",
+                        help="Persistent hash cache file to reuse digests across runs")
+    parser.add_argument("--sample-kb", type=int, default=SAMPLE_SIZE // 1024,
+                        help="KiB hashed from each end of a file before the full digest")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of concurrent hashing threads (default: 1)")
+    parser.add_argument("--max-inflight-mb", type=int,
+                        default=MAX_INFLIGHT_BYTES // (1024 * 1024),
+                        help="Upper bound on MiB queued for hashing at once")
+    parser.add_argument("--algorithm", choices=sorted(ALGORITHMS),
+                        default=DEFAULT_ALGORITHM,
+                        help=f"Digest algorithm (default: {DEFAULT_ALGORITHM})")
+    parser.add_argument("--block-kb", type=int, default=BLOCK_SIZE // 1024,
+                        help="Read block size in KiB when hashing whole files")
+    parser.add_argument("--include", action="append", metavar="GLOB",
+                        help="Only consider files matching this glob (repeatable)")
+    parser.add_argument("--exclude", action="append", metavar="GLOB",
+                        help="Skip files and directories matching this glob (repeatable)")
+    parser.add_argument("--follow-symlinks", action="store_true",
+                        help="Follow symlinked files and directories")
+    parser.add_argument("--format", choices=["text", "jsonl"], default="text",
+                        help="Output format; jsonl emits one JSON object per set")
+    parser.add_argument("--action", choices=["hardlink", "reflink"],
+                        help="Replace duplicates with links to the first copy")
+    parser.add_argument("--apply", action="store_true",
+                        help="Apply --action (otherwise only preview it)")
+    args = parser.parse_args()
+
+    find_duplicates(args.directory, recursive=not args.no_recursive,
+                    cache_path=args.cache, sample_size=args.sample_kb * 1024,
+                    workers=args.workers,
+                    max_inflight_bytes=args.max_inflight_mb * 1024 * 1024,
+                    algorithm=args.algorithm, block_size=args.block_kb * 1024,
+                    include=args.include, exclude=args.exclude,
+                    follow_symlinks=args.follow_symlinks,
+                    output_format=args.format, action=args.action, apply=args.apply)
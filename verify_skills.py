@@ -1,14 +1,101 @@
+import argparse
+import hashlib
+import json
+import os
+import struct
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
 
-def verify_skill_zip(zip_path):
-    """Verify a skill zip file has correct structure and is not corrupted"""
+# Local file header: signature, versions, flags, method, time, date, CRC,
+# sizes and name/extra lengths (see APPNOTE.TXT 4.3.7)
+LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')
+LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+SUPPORTED_METHODS = {zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED,
+                     zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA}
+# Frontmatter fields must appear within this many lines of SKILL.md
+FRONTMATTER_LINES = 10
+CACHE_NAME = ".verify-cache.json"
+# Bump when the checks change so older passes are not trusted
+CACHE_VERSION = 1
+
+
+def check_central_directory(zf, archive_size):
+    """
+    Cross-check every central directory entry against its local header.
+
+    Only headers are read, never member data: offsets and sizes must fit
+    in the archive, and the local header must agree on the name and,
+    unless a data descriptor is used, on the CRC and sizes.
+
+    Returns:
+        None if consistent, otherwise a description of the first problem
+    """
+    seen = set()
+    for info in zf.infolist():
+        if info.filename in seen:
+            return f"Duplicate entry: {info.filename}"
+        seen.add(info.filename)
+
+        if info.compress_type not in SUPPORTED_METHODS:
+            return f"Unsupported compression in {info.filename}"
+        if info.header_offset + LOCAL_HEADER.size + info.compress_size > archive_size:
+            return f"Truncated entry: {info.filename}"
+
+        zf.fp.seek(info.header_offset)
+        header = zf.fp.read(LOCAL_HEADER.size)
+        if len(header) < LOCAL_HEADER.size:
+            return f"Truncated entry: {info.filename}"
+        (signature, _, flags, method, _, _, crc, compress_size, file_size,
+         name_length, _) = LOCAL_HEADER.unpack(header)
+        if signature != LOCAL_HEADER_SIGNATURE:
+            return f"Bad local header for {info.filename}"
+
+        name = zf.fp.read(name_length)
+        if name.decode('utf-8' if flags & 0x800 else 'cp437') != info.orig_filename:
+            return f"Local header name mismatch for {info.filename}"
+        if method != info.compress_type:
+            return f"Compression mismatch for {info.filename}"
+        # Bit 3: CRC and sizes live in a trailing data descriptor instead
+        if not flags & 0x08 and (crc != info.CRC
+                                 or compress_size != info.compress_size
+                                 or file_size != info.file_size):
+            return f"CRC or size mismatch for {info.filename}"
+    return None
+
+
+def read_frontmatter(zf, name='SKILL.md', max_lines=FRONTMATTER_LINES):
+    """Stream just the first max_lines lines of a member, decoded as UTF-8."""
+    lines = []
+    with zf.open(name) as f:
+        for _ in range(max_lines):
+            line = f.readline()
+            if not line:
+                break
+            lines.append(line.decode('utf-8').rstrip('\r\n'))
+    return lines
+
+
+def verify_skill_zip(zip_path, deep=False):
+    """
+    Verify a skill zip file has correct structure and is not corrupted.
+
+    The default fast mode reads the central directory and local headers
+    plus the first lines of SKILL.md. With deep=True every member is
+    decompressed and its CRC checked as well.
+    """
     try:
         with zipfile.ZipFile(zip_path, 'r') as zf:
             # Test integrity
-            if zf.testzip() is not None:
-                return False, "Corrupted"
+            if deep:
+                if zf.testzip() is not None:
+                    return False, "Corrupted"
+            else:
+                problem = check_central_directory(zf, Path(zip_path).stat().st_size)
+                if problem:
+                    return False, problem
 
             # Check for SKILL.md at root
             files = zf.namelist()
@@ -16,14 +103,13 @@ def verify_skill_zip(zip_path):
                 return False, "No SKILL.md at root"
 
             # Read and verify SKILL.md has YAML frontmatter
-            skill_content = zf.read('SKILL.md').decode('utf-8')
-            if not skill_content.startswith('---'):
+            lines = read_frontmatter(zf)
+            if not lines or not lines[0].startswith('---'):
                 return False, "Missing YAML frontmatter"
 
             # Check if it has name and description
-            lines = skill_content.split('\n')
-            has_name = any('name:' in line for line in lines[:10])
-            has_desc = any('description:' in line for line in lines[:10])
+            has_name = any('name:' in line for line in lines)
+            has_desc = any('description:' in line for line in lines)
 
             if not has_name or not has_desc:
                 return False, "Missing name or description"
@@ -33,29 +119,189 @@ def verify_skill_zip(zip_path):
     except Exception as e:
         return False, str(e)
 
-# Test all zips
-skill_zips = Path('skill-zips')
-if not skill_zips.exists():
-    print("skill-zips directory not found!")
-    sys.exit(1)
 
-print("Verifying all skill zip files...\n")
-print(f"{'Skill Name':<35} {'Status':<10} {'Details'}")
-print("-" * 70)
+def archive_digest(zip_path):
+    """SHA-256 of an archive's bytes."""
+    hasher = hashlib.sha256()
+    with open(zip_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class VerifyCache:
+    """
+    Record of archives that already passed verification.
+
+    An archive is trusted again if its size and mtime are unchanged, or
+    failing that if its SHA-256 still matches. A deep run only trusts
+    entries that were themselves verified deeply.
+    """
+
+    def __init__(self, cache_path):
+        """Load the cache, ignoring it if missing or from another version."""
+        self.cache_path = Path(cache_path)
+        self.entries = {}
+        try:
+            data = json.loads(self.cache_path.read_text(encoding='utf-8'))
+            if data.get('version') == CACHE_VERSION:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            pass
+
+    def lookup(self, zip_path, deep):
+        """
+        Return True if the archive is known to have passed.
+
+        An archive that cannot be read (e.g. deleted mid-run) is never
+        trusted, so it goes on to be verified and reported as failed.
+        """
+        entry = self.entries.get(Path(zip_path).name)
+        if not entry or (deep and not entry['deep']):
+            return False
+        try:
+            st = os.stat(zip_path)
+            if entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+                return True
+            if entry['size'] == st.st_size and entry['sha256'] == archive_digest(zip_path):
+                entry['mtime_ns'] = st.st_mtime_ns
+                return True
+        except OSError:
+            pass
+        return False
+
+    def record(self, zip_path, deep):
+        """Remember that an archive passed."""
+        st = os.stat(zip_path)
+        self.entries[Path(zip_path).name] = {
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'sha256': archive_digest(zip_path),
+            'deep': deep,
+        }
+
+    def forget(self, zip_path):
+        """Drop any record of an archive, e.g. after it failed."""
+        self.entries.pop(Path(zip_path).name, None)
+
+    def save(self):
+        """Atomically write the cache to disk."""
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        tmp_path.write_text(
+            json.dumps({'version': CACHE_VERSION, 'entries': self.entries},
+                       indent=2, sort_keys=True),
+            encoding='utf-8'
+        )
+        os.replace(tmp_path, self.cache_path)
+
+
+def verify_archives(zip_paths, deep=False, jobs=1, cache=None):
+    """
+    Verify many archives, optionally on a thread pool and with a cache.
+
+    zlib and file reads release the GIL, so threads overlap the work.
+    Workers only look entries up; new passes are recorded and the cache
+    is saved from the calling thread.
+
+    Args:
+        zip_paths: Archives to verify
+        deep: Decompress every member (see verify_skill_zip)
+        jobs: Number of worker threads
+        cache: Optional VerifyCache; archives that already passed are skipped
+
+    Returns:
+        List of result dicts (name, path, valid, message, cached, seconds)
+        in the order of zip_paths
+    """
+    def job(zip_path):
+        start = time.perf_counter()
+        if cache is not None and cache.lookup(zip_path, deep):
+            return True, "OK (cached)", True, time.perf_counter() - start
+        is_valid, message = verify_skill_zip(zip_path, deep=deep)
+        return is_valid, message, False, time.perf_counter() - start
+
+    zip_paths = list(zip_paths)
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+        outcomes = list(pool.map(job, zip_paths))
+
+    results = []
+    for zip_path, (is_valid, message, was_cached, seconds) in zip(zip_paths, outcomes):
+        if cache is not None and not was_cached:
+            try:
+                if is_valid:
+                    cache.record(zip_path, deep)
+                else:
+                    cache.forget(zip_path)
+            except OSError:
+                # Gone since it was verified; just don't remember it
+                cache.forget(zip_path)
+        results.append({
+            'name': Path(zip_path).stem,
+            'path': str(zip_path),
+            'valid': is_valid,
+            'message': message,
+            'cached': was_cached,
+            'seconds': round(seconds, 6),
+        })
+    if cache is not None:
+        cache.save()
+    return results
+
+
+def main():
+    """Verify every zip under skill-zips/ and print a report."""
+    parser = argparse.ArgumentParser(description="Verify skill zip files")
+    parser.add_argument("--deep", action="store_true",
+                        help="Decompress every member and check its CRC")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Number of archives verified concurrently")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Re-verify everything and ignore {CACHE_NAME}")
+    parser.add_argument("--json", action="store_true",
+                        help="Print a JSON report instead of a table")
+    args = parser.parse_args()
+
+    # Test all zips
+    skill_zips = Path('skill-zips')
+    if not skill_zips.exists():
+        print("skill-zips directory not found!")
+        return 1
+
+    cache = None if args.no_cache else VerifyCache(skill_zips / CACHE_NAME)
+    start = time.perf_counter()
+    results = verify_archives(sorted(skill_zips.glob('*.zip')), deep=args.deep,
+                              jobs=args.jobs, cache=cache)
+    elapsed = time.perf_counter() - start
+    all_good = all(r['valid'] for r in results)
+
+    if args.json:
+        print(json.dumps({
+            'archives': results,
+            'summary': {
+                'total': len(results),
+                'valid': sum(r['valid'] for r in results),
+                'cached': sum(r['cached'] for r in results),
+                'deep': args.deep,
+                'seconds': round(elapsed, 6),
+            },
+        }, indent=2))
+        return 0 if all_good else 1
+
+    print("Verifying all skill zip files...\n")
+    print(f"{'Skill Name':<35} {'Status':<10} {'Details'}")
+    print("-" * 70)
 
-all_good = True
-for zip_file in sorted(skill_zips.glob('*.zip')):
-    name = zip_file.stem
-    is_valid, message = verify_skill_zip(zip_file)
+    for result in results:
+        status = "[OK]" if result['valid'] else "[ERROR]"
+        print(f"{result['name']:<35} {status:<10} {result['message']}")
 
-    status = "[OK]" if is_valid else "[ERROR]"
-    print(f"{name:<35} {status:<10} {message}")
+    print("\n" + "=" * 70)
+    if all_good:
+        print("[SUCCESS] All skills are valid and ready to upload!")
+    else:
+        print("[WARNING] Some skills have issues - check above for details")
+    return 0 if all_good else 1
 
-    if not is_valid:
-        all_good = False
 
-print("\n" + "=" * 70)
-if all_good:
-    print("[SUCCESS] All skills are valid and ready to upload!")
-else:
-    print("[WARNING] Some skills have issues - check above for details")
+if __name__ == "__main__":
+    sys.exit(main())
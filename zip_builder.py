@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Shared engine for building skill zip archives.
+
+Used by package_skills.py and create_skill_zips.py.
+"""
+
+import hashlib
+import json
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+# Fixed timestamp for every archive entry so identical inputs produce
+# byte-identical zips (the zip format cannot represent dates before 1980)
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+MANIFEST_NAME = ".build-manifest.json"
+# Build byproducts that never belong in a skill archive
+EXCLUDED_DIRS = {'__pycache__', '.pytest_cache', '.mypy_cache'}
+EXCLUDED_SUFFIXES = {'.pyc', '.pyo'}
+
+# Formats that are already compressed; deflating them only burns CPU
+STORED_SUFFIXES = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.whl',
+    '.mp3', '.mp4', '.m4a', '.mov', '.webm', '.ogg',
+    '.woff', '.woff2', '.pdf', '.docx', '.xlsx', '.pptx',
+}
+TEXT_SUFFIXES = {
+    '.md', '.txt', '.py', '.sh', '.js', '.ts', '.json', '.yml', '.yaml',
+    '.toml', '.html', '.css', '.csv', '.xml', '.svg',
+}
+# Text files above this size may use --large-text compression
+LARGE_TEXT_SIZE = 1024 * 1024
+LARGE_TEXT_METHODS = {
+    'lzma': zipfile.ZIP_LZMA,
+    'bzip2': zipfile.ZIP_BZIP2,
+}
+
+
+def skill_files(skill_path, arc_root):
+    """
+    Return the files of a skill as a sorted list of (path, arcname) pairs.
+
+    Args:
+        skill_path: Skill directory to collect
+        arc_root: Directory that archive names are made relative to
+    """
+    files = []
+    for file in skill_path.rglob('*'):
+        if (file.is_file() and file.suffix not in EXCLUDED_SUFFIXES
+                and not EXCLUDED_DIRS.intersection(file.parts)):
+            arcname = file.relative_to(arc_root).as_posix()
+            files.append((file, arcname))
+    return sorted(files, key=lambda item: item[1])
+
+
+def tree_hash(files):
+    """Content hash of a skill's file tree (names, modes and bytes)."""
+    hasher = hashlib.sha256()
+    for file, arcname in files:
+        executable = os.access(file, os.X_OK)
+        hasher.update(f"{arcname}\0{int(executable)}\0".encode('utf-8'))
+        hasher.update(hashlib.sha256(file.read_bytes()).digest())
+    return hasher.hexdigest()
+
+
+def file_digest(path):
+    """SHA-256 of a file, or None if it does not exist."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def load_manifest(output_dir):
+    """Load the build manifest mapping skill names to their last build."""
+    manifest_path = output_dir / MANIFEST_NAME
+    try:
+        return json.loads(manifest_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output_dir, manifest):
+    """Write the build manifest atomically."""
+    manifest_path = output_dir / MANIFEST_NAME
+    tmp_path = manifest_path.with_name(manifest_path.name + '.tmp')
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n",
+                        encoding='utf-8')
+    os.replace(tmp_path, manifest_path)
+
+
+def compression_for(arcname, size, large_text=None):
+    """
+    Pick the compression method and level for one archive entry.
+
+    Already-compressed formats are stored, small text is deflated at the
+    highest level (cheap at that size), large text can optionally use
+    LZMA or bzip2, and everything else gets the default deflate level.
+
+    Returns:
+        (compress_type, compresslevel) tuple
+    """
+    suffix = os.path.splitext(arcname)[1].lower()
+    if suffix in STORED_SUFFIXES:
+        return zipfile.ZIP_STORED, None
+    if suffix in TEXT_SUFFIXES:
+        if size >= LARGE_TEXT_SIZE and large_text:
+            return LARGE_TEXT_METHODS[large_text], None
+        if size < LARGE_TEXT_SIZE:
+            return zipfile.ZIP_DEFLATED, 9
+    return zipfile.ZIP_DEFLATED, 6
+
+
+def write_zip(zip_path, files, large_text=None):
+    """
+    Write a reproducible zip: sorted entries, fixed timestamps and modes.
+
+    The archive is written to a temporary name and renamed into place so an
+    interrupted build never leaves a truncated zip behind.
+
+    Returns:
+        Dict with input bytes, output bytes and number of stored entries
+    """
+    stats = {'bytes_in': 0, 'stored': 0}
+    tmp_path = zip_path.with_name(zip_path.name + '.tmp')
+    with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for file, arcname in files:
+            data = file.read_bytes()
+            compress_type, level = compression_for(arcname, len(data), large_text)
+            info = zipfile.ZipInfo(arcname, date_time=ZIP_EPOCH)
+            info.compress_type = compress_type
+            mode = 0o755 if os.access(file, os.X_OK) else 0o644
+            info.external_attr = (0o100000 | mode) << 16
+            info.create_system = 3  # Unix, so the mode bits are honoured
+            zipf.writestr(info, data, compresslevel=level)
+            stats['bytes_in'] += len(data)
+            stats['stored'] += compress_type == zipfile.ZIP_STORED
+    os.replace(tmp_path, zip_path)
+    stats['bytes_out'] = zip_path.stat().st_size
+    return stats
+
+
+def format_stats(entry, seconds):
+    """One-line size and timing summary for a build report."""
+    bytes_in = entry.get('bytes_in', 0)
+    bytes_out = entry.get('bytes_out', 0)
+    ratio = 100 * bytes_out / bytes_in if bytes_in else 0
+    return (f"{entry['files']} files, {bytes_in / 1024:.1f} KB -> "
+            f"{bytes_out / 1024:.1f} KB ({ratio:.0f}%), "
+            f"{entry.get('stored', 0)} stored, {seconds:.2f}s")
+
+
+def build_zip(skill_path, zip_path, arc_root, previous=None, force=False,
+              large_text=None):
+    """
+    Build a skill archive unless the last recorded build is still current.
+
+    Args:
+        skill_path: Skill directory to archive
+        zip_path: Destination zip file
+        arc_root: Directory that archive names are made relative to
+        previous: Manifest entry from the last build, if any
+        force: Rebuild even if the skill is unchanged
+        large_text: Optional "lzma" or "bzip2" for text over LARGE_TEXT_SIZE
+
+    Returns:
+        (message, manifest_entry) tuple
+    """
+    start = time.perf_counter()
+    files = skill_files(skill_path, arc_root)
+    content_hash = tree_hash(files)
+    # The policy is part of the build inputs, so changing it forces a rebuild
+    policy = f"v1;large_text={large_text}"
+
+    previous = previous or {}
+    if (not force and previous.get('tree_hash') == content_hash
+            and previous.get('policy') == policy
+            and previous.get('zip_sha256') == file_digest(zip_path)):
+        seconds = time.perf_counter() - start
+        return f"UP-TO-DATE ({format_stats(previous, seconds)})", previous
+
+    stats = write_zip(zip_path, files, large_text)
+    entry = {
+        'tree_hash': content_hash,
+        'policy': policy,
+        'zip_sha256': file_digest(zip_path),
+        'files': len(files),
+        **stats,
+    }
+    seconds = time.perf_counter() - start
+    return f"OK ({format_stats(entry, seconds)})", entry
+
+
+def run_jobs(func, jobs_args, jobs=1):
+    """
+    Call func(*args) for every args tuple and yield the results in order.
+
+    With jobs > 1 the calls run on a process pool, since zip compression
+    is CPU-bound. func must be a module-level function so it can be
+    pickled, and results still arrive in input order so output matches
+    the serial path.
+    """
+    if jobs <= 1:
+        for args in jobs_args:
+            yield func(*args)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(func, *args) for args in jobs_args]
+        for future in futures:
+            yield future.result()